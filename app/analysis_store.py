@@ -0,0 +1,41 @@
+import hashlib
+from typing import Optional
+from .cache import ContentCache, make_key, normalize_query
+from .models import CompanyAnalysis
+
+
+class AnalysisStore:
+    """Memoizes CompanyAnalysis results per tool and scraped page content"""
+
+    def __init__(self, cache: ContentCache):
+        self.cache = cache
+
+
+    def get(self, tool_name: str, content: str) -> Optional[CompanyAnalysis]:
+        data = self.cache.get(self._key(tool_name, content))
+        if data is None:
+            return None
+        return CompanyAnalysis(**data)
+
+
+    def put(self, tool_name: str, content: str, analysis: CompanyAnalysis):
+        self.cache.set(
+            self._key(tool_name, content),
+            analysis.model_dump(),
+            tag=normalize_query(tool_name)
+        )
+
+
+    def invalidate(self, tool_name: str) -> int:
+        """Drop every stored analysis for a tool, whatever content it was built from"""
+        return self.cache.invalidate_tag(normalize_query(tool_name))
+
+
+    def stats(self):
+        return self.cache.stats()
+
+
+    @staticmethod
+    def _key(tool_name: str, content: str) -> str:
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        return make_key("analysis", normalize_query(tool_name), digest)
@@ -0,0 +1,53 @@
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+
+def read_queries(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """Yield {"id", "query"} records from JSONL lines; bare text lines are treated as queries"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = line
+
+        if isinstance(record, str):
+            yield {"id": line_no, "query": record}
+        elif isinstance(record, dict):
+            query = record.get("query") or record.get("title")
+            if query:
+                record_id = record.get("id") or record.get("request_id") or line_no
+                yield {"id": record_id, "query": query}
+
+
+def run_batch(workflow, records: Iterable[Dict[str, Any]], output: TextIO, concurrency: int = 4, resume: bool = False,
+              deadline: Optional[float] = None) -> int:
+    """Run every record through one shared workflow, writing each result as soon as it finishes"""
+    failures = 0
+
+    def run_one(record: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            state = workflow.run(record["query"], resume=resume, deadline=deadline)
+            return {**record, "elapsed": round(time.perf_counter() - started, 3), "state": state.model_dump()}
+        except Exception as e:
+            return {**record, "elapsed": round(time.perf_counter() - started, 3), "error": str(e)}
+
+    # Progress and error prints go to stderr so the output stream stays valid JSONL
+    with redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = [executor.submit(run_one, record) for record in records]
+        for future in as_completed(futures):
+            result = future.result()
+            if "error" in result:
+                failures += 1
+            output.write(json.dumps(result, default=str) + "\n")
+            output.flush()
+
+    return failures
@@ -0,0 +1,116 @@
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .models import ContentRef
+from .packer import clean_markdown
+
+
+EXCERPT_CHARS = 280
+
+
+def excerpt(text: str, limit: int = EXCERPT_CHARS) -> str:
+    """First words of the readable text, cut on a word boundary"""
+    plain = re.sub(r"\s+", " ", clean_markdown(text or "")).strip()
+    if len(plain) <= limit:
+        return plain
+    cut = plain[:limit].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,;:-") + "…"
+
+
+class BlobStore:
+    """Content-addressed store for scraped pages: one zlib-compressed file per SHA-256 digest
+
+    Identical content is written once. Files past mmap_threshold are memory-mapped on read so the
+    compressed bytes are never copied onto the heap before decompression.
+    """
+
+    def __init__(self, root: str, ttl: float = 7 * 24 * 3600, mmap_threshold: int = 64 * 1024):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.mmap_threshold = mmap_threshold
+        self.writes = 0
+        self.dedup_hits = 0
+        self.bytes_in = 0
+        self.bytes_stored = 0
+        self._lock = threading.Lock()
+        self.prune()
+
+
+    def put(self, text: str) -> ContentRef:
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+
+        if path.exists():
+            # Touch so content still in use outlives the TTL
+            os.utime(path)
+            with self._lock:
+                self.dedup_hits += 1
+        else:
+            compressed = zlib.compress(data, 6)
+            path.parent.mkdir(exist_ok=True)
+            # Write to a temp file and rename, so readers never see a partial blob
+            fd, temp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(compressed)
+            os.replace(temp, path)
+            with self._lock:
+                self.writes += 1
+                self.bytes_in += len(data)
+                self.bytes_stored += len(compressed)
+
+        return ContentRef(digest=digest, size=len(data), excerpt=excerpt(text))
+
+
+    def get(self, ref: Any) -> Optional[str]:
+        """Load content by ContentRef or digest; None when the blob is missing or corrupt"""
+        digest = ref.digest if isinstance(ref, ContentRef) else ref
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if size >= self.mmap_threshold:
+                    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        data = zlib.decompress(mapped)
+                else:
+                    data = zlib.decompress(handle.read())
+        except (OSError, zlib.error):
+            return None
+        return data.decode("utf-8")
+
+
+    def prune(self) -> int:
+        """Delete blobs not written or reused within the TTL"""
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for path in self.root.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "dedup_hits": self.dedup_hits,
+                "bytes_in": self.bytes_in,
+                "bytes_stored": self.bytes_stored,
+                "compression": round(self.bytes_stored / self.bytes_in, 3) if self.bytes_in else 0.0,
+            }
+
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest[2:]
@@ -0,0 +1,53 @@
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+from langchain_core.callbacks import BaseCallbackHandler
+from .profiling import Profiler
+
+
+class LLMProfilingHandler(BaseCallbackHandler):
+    """LangChain callback that records one span per chat model call with token usage"""
+
+    def __init__(self, profiler: Profiler, name: str = "anthropic"):
+        self.profiler = profiler
+        self.name = name
+        self._starts: Dict[UUID, tuple] = {}
+
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata: Optional[Dict[str, Any]] = None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        self._starts[run_id] = (time.perf_counter(), node)
+
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        start, node = self._starts.pop(run_id, (None, None))
+        if start is None:
+            return
+
+        attrs: Dict[str, Any] = {"node": node} if node else {}
+        usage = self._usage(response)
+        if usage:
+            attrs["input_tokens"] = usage.get("input_tokens", 0)
+            attrs["output_tokens"] = usage.get("output_tokens", 0)
+        self.profiler.record(f"{self.name}.invoke", "llm", start, time.perf_counter(), attrs)
+
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        start, node = self._starts.pop(run_id, (None, None))
+        if start is None:
+            return
+
+        attrs: Dict[str, Any] = {"node": node, "error": str(error)} if node else {"error": str(error)}
+        self.profiler.record(f"{self.name}.invoke", "llm", start, time.perf_counter(), attrs)
+
+
+    @staticmethod
+    def _usage(response) -> Optional[Dict[str, int]]:
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    return usage
+        usage = (response.llm_output or {}).get("usage")
+        return dict(usage) if isinstance(usage, dict) else None
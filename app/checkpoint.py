@@ -0,0 +1,139 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from .cache import make_key, normalize_query
+
+
+def run_id_for(query: str) -> str:
+    """Stable run ID, so rerunning the same question with resume picks up its checkpoints"""
+    return make_key("run", normalize_query(query))[:16]
+
+
+class SqliteCheckpointer(SqliteSaver):
+    """langgraph's SqliteSaver on a local file, with its async methods run on a worker thread
+
+    SqliteSaver only implements the sync API, while astream drives the graph through the
+    async one; both share the saver's connection and lock.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(sqlite3.connect(str(path), check_same_thread=False))
+
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit))):
+            yield item
+
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+class RunProgress:
+    """Work finished inside a node (one record per researched tool) and the last activity of each run
+
+    Lives next to the checkpoints so a resumed run can skip tools that finished before the
+    interruption; runs idle for longer than the TTL are pruned together with their checkpoints.
+    """
+
+    def __init__(self, path: str, checkpointer: SqliteSaver, ttl: float = 24 * 3600):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.checkpointer = checkpointer
+        self.ttl = ttl
+        self.serde = JsonPlusSerializer()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS progress (
+                    thread_id TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    value BLOB,
+                    PRIMARY KEY (thread_id, key)
+                )"""
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS runs (thread_id TEXT PRIMARY KEY, updated_at REAL NOT NULL)")
+        self.prune()
+
+
+    def touch(self, thread_id: str):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?)", (thread_id, time.time()))
+
+
+    def save(self, thread_id: str, key: str, value: Any):
+        """Record work finished inside a node so a resumed run can skip it"""
+        type_, payload = self.serde.dumps_typed(value)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)", (thread_id, key, type_, payload))
+            self._conn.execute("INSERT OR REPLACE INTO runs VALUES (?, ?)", (thread_id, time.time()))
+
+
+    def load(self, thread_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, type, value FROM progress WHERE thread_id = ?", (thread_id,)).fetchall()
+        return {key: self.serde.loads_typed((type_, value)) for key, type_, value in rows}
+
+
+    def delete(self, thread_id: str):
+        """Drop a run's checkpoints and progress"""
+        self.checkpointer.delete_thread(thread_id)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM progress WHERE thread_id = ?", (thread_id,))
+            self._conn.execute("DELETE FROM runs WHERE thread_id = ?", (thread_id,))
+
+
+    def runs(self) -> List[Tuple[str, float]]:
+        """(thread_id, last activity) for every stored run, newest first"""
+        with self._lock:
+            return self._conn.execute("SELECT thread_id, updated_at FROM runs ORDER BY updated_at DESC").fetchall()
+
+
+    def prune(self) -> int:
+        """Delete runs whose last activity is older than the TTL"""
+        cutoff = time.time() - self.ttl
+        stale = [thread_id for thread_id, updated in self.runs() if updated < cutoff]
+        for thread_id in stale:
+            self.delete(thread_id)
+        return len(stale)
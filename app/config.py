@@ -0,0 +1,131 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value else default
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value else default
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass
+class Settings:
+    """Runtime tuning knobs, overridable through environment variables"""
+    research_concurrency: int = 4
+    article_scrape_timeout: float = 15.0
+    cache_enabled: bool = True
+    cache_dir: str = ".cache"
+    cache_ttl: float = 24 * 3600
+    cache_max_mb: int = 200
+    analysis_ttl: float = 7 * 24 * 3600
+    batch_concurrency: int = 4
+    firecrawl_rate: float = 5.0
+    firecrawl_burst: int = 10
+    anthropic_rate: float = 4.0
+    anthropic_burst: int = 8
+    llm_max_retries: int = 3
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+    min_embedded_chars: int = 1000
+    analysis_mode: str = "per_tool"
+    batch_token_budget: int = 12000
+    extraction_token_budget: int = 900
+    analysis_token_budget: int = 700
+    recommendation_token_budget: int = 600
+    rule_extraction: bool = True
+    rule_confidence: float = 0.8
+    query_cache_ttl: float = 6 * 3600
+    query_cache_threshold: float = 0.85
+    server_host: str = "127.0.0.1"
+    server_port: int = 8080
+    server_workers: int = 4
+    server_queue_size: int = 32
+    server_request_timeout: float = 300.0
+    checkpoint_enabled: bool = True
+    checkpoint_ttl: float = 24 * 3600
+    blob_dir: str = ""
+    blob_ttl: float = 7 * 24 * 3600
+    http_pool_size: int = 16
+    http_warmup: bool = True
+    dedup_enabled: bool = True
+    dedup_threshold: float = 0.7
+    tool_index_enabled: bool = True
+    tool_index_ttl: float = 30 * 24 * 3600
+    tool_match_distance: int = 1
+    speculative_research: bool = False
+    speculative_tools: int = 4
+    query_deadline: float = 0.0
+    llm_timeout: float = 60.0
+    firecrawl_timeout: float = 30.0
+
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        return cls(
+            research_concurrency=_env_int("RESEARCH_CONCURRENCY", cls.research_concurrency),
+            article_scrape_timeout=_env_float("ARTICLE_SCRAPE_TIMEOUT", cls.article_scrape_timeout),
+            cache_enabled=_env_bool("CACHE_ENABLED", cls.cache_enabled),
+            cache_dir=os.getenv("CACHE_DIR") or cls.cache_dir,
+            cache_ttl=_env_float("CACHE_TTL", cls.cache_ttl),
+            cache_max_mb=_env_int("CACHE_MAX_MB", cls.cache_max_mb),
+            analysis_ttl=_env_float("ANALYSIS_TTL", cls.analysis_ttl),
+            batch_concurrency=_env_int("BATCH_CONCURRENCY", cls.batch_concurrency),
+            firecrawl_rate=_env_float("FIRECRAWL_RATE", cls.firecrawl_rate),
+            firecrawl_burst=_env_int("FIRECRAWL_BURST", cls.firecrawl_burst),
+            anthropic_rate=_env_float("ANTHROPIC_RATE", cls.anthropic_rate),
+            anthropic_burst=_env_int("ANTHROPIC_BURST", cls.anthropic_burst),
+            llm_max_retries=_env_int("LLM_MAX_RETRIES", cls.llm_max_retries),
+            circuit_failure_threshold=_env_int("CIRCUIT_FAILURE_THRESHOLD", cls.circuit_failure_threshold),
+            circuit_reset_timeout=_env_float("CIRCUIT_RESET_TIMEOUT", cls.circuit_reset_timeout),
+            min_embedded_chars=_env_int("MIN_EMBEDDED_CHARS", cls.min_embedded_chars),
+            analysis_mode=os.getenv("ANALYSIS_MODE") or cls.analysis_mode,
+            batch_token_budget=_env_int("BATCH_TOKEN_BUDGET", cls.batch_token_budget),
+            extraction_token_budget=_env_int("EXTRACTION_TOKEN_BUDGET", cls.extraction_token_budget),
+            analysis_token_budget=_env_int("ANALYSIS_TOKEN_BUDGET", cls.analysis_token_budget),
+            recommendation_token_budget=_env_int("RECOMMENDATION_TOKEN_BUDGET", cls.recommendation_token_budget),
+            rule_extraction=_env_bool("RULE_EXTRACTION", cls.rule_extraction),
+            rule_confidence=_env_float("RULE_CONFIDENCE", cls.rule_confidence),
+            query_cache_ttl=_env_float("QUERY_CACHE_TTL", cls.query_cache_ttl),
+            query_cache_threshold=_env_float("QUERY_CACHE_THRESHOLD", cls.query_cache_threshold),
+            server_host=os.getenv("SERVER_HOST") or cls.server_host,
+            server_port=_env_int("SERVER_PORT", cls.server_port),
+            server_workers=_env_int("SERVER_WORKERS", cls.server_workers),
+            server_queue_size=_env_int("SERVER_QUEUE_SIZE", cls.server_queue_size),
+            server_request_timeout=_env_float("SERVER_REQUEST_TIMEOUT", cls.server_request_timeout),
+            checkpoint_enabled=_env_bool("CHECKPOINT_ENABLED", cls.checkpoint_enabled),
+            checkpoint_ttl=_env_float("CHECKPOINT_TTL", cls.checkpoint_ttl),
+            blob_dir=os.getenv("BLOB_DIR") or cls.blob_dir,
+            blob_ttl=_env_float("BLOB_TTL", cls.blob_ttl),
+            http_pool_size=_env_int("HTTP_POOL_SIZE", cls.http_pool_size),
+            http_warmup=_env_bool("HTTP_WARMUP", cls.http_warmup),
+            dedup_enabled=_env_bool("DEDUP_ENABLED", cls.dedup_enabled),
+            dedup_threshold=_env_float("DEDUP_THRESHOLD", cls.dedup_threshold),
+            tool_index_enabled=_env_bool("TOOL_INDEX_ENABLED", cls.tool_index_enabled),
+            tool_index_ttl=_env_float("TOOL_INDEX_TTL", cls.tool_index_ttl),
+            tool_match_distance=_env_int("TOOL_MATCH_DISTANCE", cls.tool_match_distance),
+            speculative_research=_env_bool("SPECULATIVE_RESEARCH", cls.speculative_research),
+            speculative_tools=_env_int("SPECULATIVE_TOOLS", cls.speculative_tools),
+            query_deadline=_env_float("QUERY_DEADLINE", cls.query_deadline),
+            llm_timeout=_env_float("LLM_TIMEOUT", cls.llm_timeout),
+            firecrawl_timeout=_env_float("FIRECRAWL_TIMEOUT", cls.firecrawl_timeout),
+        )
@@ -0,0 +1,43 @@
+import time
+from typing import Dict, Optional
+
+
+# Share of the remaining budget each stage may use; category detection runs alongside
+# gather_articles and shares its slice
+STAGE_SHARES: Dict[str, float] = {
+    "gather_articles": 0.25,
+    "extract_tools": 0.2,
+    "research": 0.35,
+    "analyze": 0.2,
+}
+
+
+class Deadline:
+    """Wall-clock latency budget for one query; a Deadline without an end never expires"""
+
+    def __init__(self, at: Optional[float] = None):
+        self.at = at
+
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> "Deadline":
+        return cls(time.time() + seconds if seconds else None)
+
+
+    def remaining(self) -> Optional[float]:
+        if self.at is None:
+            return None
+        return max(0.0, self.at - time.time())
+
+
+    def expired(self) -> bool:
+        return self.at is not None and time.time() >= self.at
+
+
+    def stage(self, name: str) -> "Deadline":
+        """The slice of what is left for a stage, so time a fast stage saves flows to the later ones"""
+        if self.at is None:
+            return self
+        stages = list(STAGE_SHARES)
+        later = sum(STAGE_SHARES[stage] for stage in stages[stages.index(name):])
+        return Deadline(time.time() + self.remaining() * STAGE_SHARES[name] / later)
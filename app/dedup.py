@@ -0,0 +1,162 @@
+import hashlib
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Set, Tuple
+from .packer import HEADING, clean_markdown, estimate_tokens
+
+
+TOKEN = re.compile(r"[a-z0-9]+")
+MERSENNE = (1 << 61) - 1
+
+
+def shingles(text: str, size: int = 5) -> Set[int]:
+    """Hashed word n-grams; texts shorter than one shingle hash as a single shingle"""
+    words = TOKEN.findall(text.lower())
+    if len(words) <= size:
+        return {_hash(" ".join(words))} if words else set()
+    return {_hash(" ".join(words[i:i + size])) for i in range(len(words) - size + 1)}
+
+
+def _hash(text: str) -> int:
+    # 32-bit shingle hashes keep a * h + b within two machine words
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+@dataclass
+class DedupResult:
+    documents: List[str]
+    articles_dropped: int = 0
+    paragraphs_dropped: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    tokens_in: int = 0
+    tokens_out: int = 0
+    dropped: List[str] = field(default_factory=list)
+
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_in - self.bytes_out
+
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_in - self.tokens_out
+
+
+class MinHashDeduper:
+    """Drops duplicate and near-duplicate articles, then repeated paragraphs across what is left
+
+    Each paragraph gets a MinHash signature over word shingles, and an article's signature is the
+    element-wise minimum of its paragraphs'. LSH banding finds candidate pairs, and the signature
+    agreement (an estimate of Jaccard similarity) decides whether a later text is a copy of one
+    already kept. Articles use a stricter threshold, so an article that only adds a few new
+    paragraphs survives and loses just its repeated ones.
+    """
+
+    def __init__(self, threshold: float = 0.7, article_threshold: float = 0.9, num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 5, min_paragraph_words: int = 8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.article_threshold = article_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # Shorter paragraphs (headings, one-liners) are only dropped when repeated exactly
+        self.min_paragraph_words = min_paragraph_words
+        rng = random.Random(1)
+        self._perms = [(rng.randrange(1, 1 << 32), rng.randrange(0, 1 << 32)) for _ in range(num_perm)]
+
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = list(shingles(text, self.shingle_size))
+        if not hashes:
+            return ()
+        return tuple(min([(a * h + b) % MERSENNE for h in hashes]) for a, b in self._perms)
+
+
+    def similarity(self, first: Sequence[int], second: Sequence[int]) -> float:
+        if not first or not second:
+            return 0.0
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+
+
+    def dedupe(self, documents: Sequence[str]) -> DedupResult:
+        cleaned = [clean_markdown(document or "") for document in documents]
+        result = DedupResult(
+            documents=[],
+            bytes_in=sum(len(document.encode("utf-8")) for document in cleaned),
+            tokens_in=sum(estimate_tokens(document) for document in cleaned),
+        )
+
+        articles = _LSHIndex(self, self.article_threshold)
+        paragraphs = _LSHIndex(self, self.threshold)
+        exact: Set[str] = set()
+        # Syndicated copies repeat paragraphs verbatim, so each distinct paragraph is hashed once
+        computed: Dict[str, Tuple[int, ...]] = {}
+        for document in cleaned:
+            parts = [part.strip() for part in re.split(r"\n\s*\n", document) if part.strip()]
+            if not parts:
+                continue
+            keys = [" ".join(TOKEN.findall(part.lower())) for part in parts]
+            signatures = [computed[key] if key in computed else computed.setdefault(key, self.signature(key)) for key in keys]
+            if not articles.add(self._union(signatures)):
+                result.articles_dropped += 1
+                result.dropped.append(document[:80])
+                continue
+
+            kept = []
+            for paragraph, key, signature in zip(parts, keys, signatures):
+                if HEADING.match(paragraph) and "\n" not in paragraph:
+                    # Headings are cheap and anchor whatever body text survives below them
+                    kept.append(paragraph)
+                    continue
+                if key in exact:
+                    result.paragraphs_dropped += 1
+                    continue
+                exact.add(key)
+                if len(key.split()) >= self.min_paragraph_words and not paragraphs.add(signature):
+                    result.paragraphs_dropped += 1
+                    result.dropped.append(paragraph[:80])
+                    continue
+                kept.append(paragraph)
+            if kept:
+                result.documents.append("\n\n".join(kept))
+
+        result.bytes_out = sum(len(document.encode("utf-8")) for document in result.documents)
+        result.tokens_out = sum(estimate_tokens(document) for document in result.documents)
+        return result
+
+
+    def _union(self, signatures: List[Tuple[int, ...]]) -> Tuple[int, ...]:
+        # The MinHash of a union is the element-wise minimum of the parts' MinHashes
+        signatures = [signature for signature in signatures if signature]
+        return tuple(map(min, zip(*signatures))) if signatures else ()
+
+
+class _LSHIndex:
+    """Banded MinHash index; add() keeps a signature unless it nearly matches one already kept"""
+
+    def __init__(self, deduper: MinHashDeduper, threshold: float):
+        self.deduper = deduper
+        self.threshold = threshold
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = {}
+        self.signatures: List[Tuple[int, ...]] = []
+
+
+    def add(self, signature: Tuple[int, ...]) -> bool:
+        if not signature:
+            return True
+        rows = self.deduper.rows
+        keys = [(band, signature[band * rows:(band + 1) * rows]) for band in range(self.deduper.bands)]
+        candidates = {i for key in keys for i in self.buckets.get(key, [])}
+        if any(self.deduper.similarity(signature, self.signatures[i]) >= self.threshold for i in candidates):
+            return False
+
+        self.signatures.append(signature)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(len(self.signatures) - 1)
+        return True
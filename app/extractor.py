@@ -0,0 +1,258 @@
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+from .models import CompanyAnalysis
+
+
+REQUIRED_FIELDS = (
+    "pricing_model",
+    "is_open_source",
+    "tech_stack",
+    "description",
+    "api_available",
+    "language_support",
+    "integration_capabilities",
+)
+
+LANGUAGES = {
+    "Python": r"\bPython\b",
+    "JavaScript": r"\bJavaScript\b|\bJS\b",
+    "TypeScript": r"\bTypeScript\b",
+    "Go": r"\bGolang\b|\bGo\b(?=\s*(?:,|and\b|or\b|SDK|client|library|\)|\.(?:\s|$)|$))",
+    "Java": r"\bJava\b(?!Script)",
+    "Ruby": r"\bRuby\b",
+    "PHP": r"\bPHP\b",
+    "Rust": r"\bRust\b",
+    "C#": r"\bC#|\.NET\b",
+    "C++": r"\bC\+\+",
+    "Kotlin": r"\bKotlin\b",
+    "Swift": r"\bSwift\b",
+    "Elixir": r"\bElixir\b",
+    "Scala": r"\bScala\b",
+    "Dart": r"\bDart\b",
+}
+
+FRAMEWORKS = {
+    "React": r"\bReact\b",
+    "Next.js": r"\bNext\.?js\b",
+    "Vue": r"\bVue(?:\.js)?\b",
+    "Angular": r"\bAngular\b",
+    "Svelte": r"\bSvelte(?:Kit)?\b",
+    "Node.js": r"\bNode(?:\.js)?\b",
+    "Django": r"\bDjango\b",
+    "Flask": r"\bFlask\b",
+    "FastAPI": r"\bFastAPI\b",
+    "Rails": r"\bRails\b",
+    "Spring": r"\bSpring Boot\b",
+    "PostgreSQL": r"\bPostgres(?:QL)?\b",
+    "MySQL": r"\bMySQL\b",
+    "MongoDB": r"\bMongoDB\b",
+    "Redis": r"\bRedis\b",
+    "SQLite": r"\bSQLite\b",
+    "GraphQL": r"\bGraphQL\b",
+    "REST API": r"\bREST(?:ful)?\s+API\b",
+    "Docker": r"\bDocker\b",
+    "Kubernetes": r"\bKubernetes\b|\bK8s\b",
+}
+
+INTEGRATIONS = {
+    "GitHub": r"\bGitHub\b",
+    "GitLab": r"\bGitLab\b",
+    "Bitbucket": r"\bBitbucket\b",
+    "VS Code": r"\bVS ?Code\b|\bVisual Studio Code\b",
+    "JetBrains": r"\bJetBrains\b|\bIntelliJ\b",
+    "Docker": r"\bDocker\b",
+    "Kubernetes": r"\bKubernetes\b",
+    "AWS": r"\bAWS\b|\bAmazon Web Services\b",
+    "Google Cloud": r"\bGoogle Cloud\b|\bGCP\b",
+    "Azure": r"\bAzure\b",
+    "Slack": r"\bSlack\b",
+    "Vercel": r"\bVercel\b",
+    "Terraform": r"\bTerraform\b",
+    "Zapier": r"\bZapier\b",
+    "Jira": r"\bJira\b",
+    "Datadog": r"\bDatadog\b",
+}
+
+LANGUAGE_PATTERNS = {name: re.compile(pattern) for name, pattern in LANGUAGES.items()}
+FRAMEWORK_PATTERNS = {name: re.compile(pattern) for name, pattern in FRAMEWORKS.items()}
+INTEGRATION_PATTERNS = {name: re.compile(pattern) for name, pattern in INTEGRATIONS.items()}
+
+PRICE = re.compile(r"[$€£]\s?(?!0(?:\.00)?\b)\d+(?:[.,]\d+)?\s*(?:/|per\s)\s*(?:mo|month|user|seat|year|yr)", re.IGNORECASE)
+FREE_TIER = re.compile(r"\bfree (?:plan|tier|forever|to start|for individuals)\b|\$0\b|\bfree\s*\|", re.IGNORECASE)
+FULLY_FREE = re.compile(r"\b(?:completely|totally|100%) free\b|\bfree and open[- ]source\b", re.IGNORECASE)
+ENTERPRISE = re.compile(r"\benterprise\b|\bcontact sales\b", re.IGNORECASE)
+LICENSE = re.compile(r"\b(?:MIT|Apache(?: 2\.0)?|GPL(?:v[23])?|AGPL|LGPL|BSD|MPL)(?:[- ]2\.0)? licen[cs]e\b|\blicensed under the (?:MIT|Apache|GPL|AGPL|BSD|MPL)", re.IGNORECASE)
+OPEN_SOURCE = re.compile(r"\bopen[- ]source\b|\bsource code (?:is )?(?:available )?on GitHub\b|\bgithub\.com/[\w.-]+/[\w.-]+", re.IGNORECASE)
+PROPRIETARY = re.compile(r"\bproprietary\b|\bclosed[- ]source\b", re.IGNORECASE)
+API = re.compile(r"\bREST(?:ful)?\s+API\b|\bGraphQL\b|\bSDKs?\b|\bAPI reference\b|\bclient librar(?:y|ies)\b|\bgRPC\b", re.IGNORECASE)
+LANGUAGE_CONTEXT = re.compile(r"\bSDKs?\b|\blibrar(?:y|ies)\b|\bclients?\b|\bsupport(?:s|ed)?\b|\blanguages?\b", re.IGNORECASE)
+INTEGRATION_CONTEXT = re.compile(r"\bintegrat\w*|\bworks with\b|\bconnects? (?:to|with)\b|\bplugins?\b|\bextensions?\b", re.IGNORECASE)
+DESCRIPTION_VERBS = r"(?:is an?|are an?|lets|helps|provides|offers|enables|makes it easy)"
+MARKDOWN_NOISE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)|[*_`#>]")
+
+
+@dataclass
+class RuleResult:
+    """Fields read straight from page text, with a confidence per field"""
+    fields: Dict[str, Any] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+    threshold: float = 0.8
+
+
+    def confident(self) -> Dict[str, Any]:
+        return {
+            name: value for name, value in self.fields.items()
+            if self.confidence.get(name, 0.0) >= self.threshold
+        }
+
+
+    @property
+    def complete(self) -> bool:
+        return all(name in self.confident() for name in REQUIRED_FIELDS)
+
+
+    def analysis(self) -> CompanyAnalysis:
+        return CompanyAnalysis(**self.confident())
+
+
+    def fill(self, analysis: CompanyAnalysis) -> CompanyAnalysis:
+        """Use confident rule values where the LLM answer is unknown or empty"""
+        updates = {}
+        for name, value in self.confident().items():
+            current = getattr(analysis, name)
+            if current in (None, "", [], "Unknown"):
+                updates[name] = value
+        return analysis.model_copy(update=updates) if updates else analysis
+
+
+class RuleExtractor:
+    """Deterministic CompanyAnalysis extraction from scraped markdown using precompiled patterns"""
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.pages = 0
+        self.complete = 0
+        self.field_hits = Counter()
+        self._lock = threading.Lock()
+
+
+    def extract(self, content: str, tool_name: str = "") -> RuleResult:
+        result = RuleResult(threshold=self.threshold)
+        lines = [line for line in content.splitlines() if line.strip()]
+
+        self._pricing(content, result)
+        self._open_source(content, result)
+        self._api(content, result)
+        self._languages(lines, result)
+        self._integrations(lines, result)
+        self._tech_stack(content, result)
+        self._description(lines, tool_name, result)
+
+        confident = result.confident()
+        with self._lock:
+            self.pages += 1
+            self.complete += int(result.complete)
+            self.field_hits.update(confident.keys())
+        return result
+
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pages = self.pages
+            return {
+                "pages": pages,
+                "llm_skipped": self.complete,
+                "hit_rate": round(self.complete / pages, 3) if pages else 0.0,
+                "fields": {name: round(self.field_hits[name] / pages, 3) if pages else 0.0 for name in REQUIRED_FIELDS},
+            }
+
+
+    @staticmethod
+    def _set(result: RuleResult, name: str, value: Any, confidence: float):
+        result.fields[name] = value
+        result.confidence[name] = confidence
+
+
+    def _pricing(self, content: str, result: RuleResult):
+        paid = bool(PRICE.search(content))
+        free = bool(FREE_TIER.search(content))
+        enterprise = bool(ENTERPRISE.search(content))
+
+        if FULLY_FREE.search(content) and not paid:
+            self._set(result, "pricing_model", "Free", 0.9)
+        elif paid and not free:
+            self._set(result, "pricing_model", "Paid", 0.9)
+        elif free and not paid and not enterprise:
+            self._set(result, "pricing_model", "Free", 0.85)
+        elif enterprise and not paid and not free:
+            self._set(result, "pricing_model", "Enterprise", 0.8)
+        elif paid and free:
+            # Freemium pages are a judgement call between "Free" and "Paid"; leave it to the LLM
+            self._set(result, "pricing_model", "Paid", 0.6)
+
+
+    def _open_source(self, content: str, result: RuleResult):
+        if LICENSE.search(content):
+            self._set(result, "is_open_source", True, 0.9)
+        elif PROPRIETARY.search(content):
+            self._set(result, "is_open_source", False, 0.8)
+        elif OPEN_SOURCE.search(content):
+            # "Open source" alone is often about integrations or community projects
+            self._set(result, "is_open_source", True, 0.7)
+
+
+    def _api(self, content: str, result: RuleResult):
+        if API.search(content):
+            self._set(result, "api_available", True, 0.9)
+
+
+    def _languages(self, lines: List[str], result: RuleResult):
+        in_context, anywhere = [], []
+        for line in lines:
+            found = [name for name, pattern in LANGUAGE_PATTERNS.items() if pattern.search(line)]
+            anywhere.extend(name for name in found if name not in anywhere)
+            if found and LANGUAGE_CONTEXT.search(line):
+                in_context.extend(name for name in found if name not in in_context)
+
+        if in_context:
+            self._set(result, "language_support", in_context, 0.85)
+        elif anywhere:
+            self._set(result, "language_support", anywhere, 0.6)
+
+
+    def _integrations(self, lines: List[str], result: RuleResult):
+        in_context, anywhere = [], []
+        for line in lines:
+            found = [name for name, pattern in INTEGRATION_PATTERNS.items() if pattern.search(line)]
+            anywhere.extend(name for name in found if name not in anywhere)
+            if found and INTEGRATION_CONTEXT.search(line):
+                in_context.extend(name for name in found if name not in in_context)
+
+        if in_context:
+            self._set(result, "integration_capabilities", in_context, 0.85)
+        elif anywhere:
+            self._set(result, "integration_capabilities", anywhere, 0.6)
+
+
+    def _tech_stack(self, content: str, result: RuleResult):
+        stack = list(result.fields.get("language_support", []))
+        stack.extend(name for name, pattern in FRAMEWORK_PATTERNS.items() if pattern.search(content) and name not in stack)
+        if len(stack) >= 2:
+            self._set(result, "tech_stack", stack, 0.8)
+        elif stack:
+            self._set(result, "tech_stack", stack, 0.6)
+
+
+    def _description(self, lines: List[str], tool_name: str, result: RuleResult):
+        if not tool_name:
+            return
+        pattern = re.compile(rf"\b{re.escape(tool_name)}\b[^.\n]*?\b{DESCRIPTION_VERBS}\b[^.\n]*\.", re.IGNORECASE)
+        for line in lines[:15]:
+            text = MARKDOWN_NOISE.sub(lambda m: m.group(1) or "", line).strip()
+            match = pattern.search(text)
+            if match and 30 <= len(match.group(0)) <= 220:
+                self._set(result, "description", match.group(0).strip(), 0.85)
+                return
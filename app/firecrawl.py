@@ -1,79 +1,230 @@
 import os
 import json
+import threading
 import time
+from types import FunctionType, MethodType
+from typing import Any, Dict, Optional
+import requests
 from firecrawl import FirecrawlApp, ScrapeOptions
+from firecrawl import firecrawl as sdk
 from dotenv import load_dotenv
+from .cache import ContentCache, make_key, normalize_query, normalize_url
+from .profiling import Profiler
+from .scheduler import CircuitOpenError, ProviderPolicy, Scheduler
 
 load_dotenv()
 
 
+class _SessionRequests:
+    """Stands in for the requests module inside SDK methods: post, get and delete go through one Session"""
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        # The SDK hands Firecrawl's millisecond timeout (plus 5s) to requests, which reads it as seconds
+        payload = kwargs.get("json") or {}
+        kwargs["timeout"] = (payload["timeout"] + 5000) / 1000 if payload.get("timeout") else None
+        return self.session.post(url, **kwargs)
+
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.session.delete(url, **kwargs)
+
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+
+class PooledFirecrawlApp(FirecrawlApp):
+    """FirecrawlApp whose HTTP requests go through a shared keep-alive Session
+
+    The SDK sends them with module-level requests.post/get/delete, which open a new connection
+    per call. Every SDK method that does so runs here unchanged, with its requests global
+    resolved to the Session; the SDK module itself is left alone.
+    """
+
+    def __init__(self, session: requests.Session, api_key: Optional[str] = None, api_url: Optional[str] = None):
+        super().__init__(api_key=api_key, api_url=api_url)
+        self.session = session
+        namespace = {**vars(sdk), "requests": _SessionRequests(session)}
+        for name, method in vars(FirecrawlApp).items():
+            if isinstance(method, FunctionType) and "requests" in method.__code__.co_names:
+                setattr(self, name, MethodType(_with_globals(method, namespace), self))
+
+
+def _with_globals(fn: FunctionType, namespace: Dict[str, Any]) -> FunctionType:
+    clone = FunctionType(fn.__code__, namespace, fn.__name__, fn.__defaults__, fn.__closure__)
+    clone.__kwdefaults__ = fn.__kwdefaults__
+    clone.__doc__ = fn.__doc__
+    return clone
+
+
 class FirecrawlService:
-    def __init__(self):
-        api_key = os.getenv("FIRECRAWL_API_KEY")
-        if not api_key:
-            raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
-        self.app = FirecrawlApp(api_key=api_key)
+    def __init__(
+        self,
+        cache: Optional[ContentCache] = None,
+        profiler: Optional[Profiler] = None,
+        app: Optional[FirecrawlApp] = None,
+        scheduler: Optional[Scheduler] = None,
+        min_embedded_chars: int = 1000,
+        timeout: Optional[float] = None,
+        session: Optional[requests.Session] = None
+    ):
+        if app is None:
+            api_key = os.getenv("FIRECRAWL_API_KEY")
+            if not api_key:
+                raise ValueError("Missing FIRECRAWL_API_KEY environment variable")
+            app = PooledFirecrawlApp(session, api_key=api_key) if session else FirecrawlApp(api_key=api_key)
+        self.app = app
+        self.cache = cache
+        self.profiler = profiler or Profiler(enabled=False)
+        self.scheduler = scheduler or Scheduler({"firecrawl": ProviderPolicy()})
+        self.min_embedded_chars = min_embedded_chars
+        # Default per-request timeout in seconds; callers with a deadline pass a shorter one
+        self.timeout = timeout
+        self.content_stats = {"embedded": 0, "scraped": 0}
+        self._stats_lock = threading.Lock()
+
 
+    def search_companies(self, query: str, num_results: int = 5, max_retries: int = 2, timeout: Optional[float] = None):
+        with self.profiler.span("firecrawl.search", "firecrawl", cache_hit=False, retries=0, bytes=0) as span:
+            result = self._search_companies(query, num_results, max_retries, self._timeout(timeout), span)
+            span["bytes"] = sum(len(item.get("markdown") or "") for item in result.data)
+            return result
 
-    def search_companies(self, query: str, num_results: int = 5, max_retries: int = 2):
-        for attempt in range(max_retries + 1):
-            try:
-                result = self.app.search(
+
+    def _search_companies(self, query: str, num_results: int, max_retries: int, timeout: Optional[float], span: dict):
+        cache_key = make_key("search", normalize_query(query), num_results, ["markdown"])
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            span["cache_hit"] = True
+            return cached
+        
+        try:
+            result = self.scheduler.call(
+                "firecrawl",
+                lambda: self.app.search(
                     query=f"{query} company pricing",
                     limit=num_results,
                     scrape_options=ScrapeOptions(
                         formats=["markdown"]
-                    )
-                )
-                return result
-            except Exception as e:
-                error_msg = str(e).lower()
-                
-                if "502" in error_msg or "bad gateway" in error_msg:
-                    if attempt < max_retries:
-                        print(f"🔄 Firecrawl 502 error, retrying in {attempt + 1}s...")
-                        time.sleep(attempt + 1)
-                        continue
-                    else:
-                        print(f"❌ Firecrawl 502 error after {max_retries} retries: {e}")
-                        return self._create_empty_result()
-                
-                if "json" in error_msg or "parse" in error_msg:
-                    print(f"⚠️ Firecrawl response parsing error: {e}")
-                    return self._create_empty_result()
-                
-                print(f"❌ Firecrawl search error: {e}")
+                    ),
+                    timeout=int(timeout * 1000) if timeout else None
+                ),
+                max_retries=max_retries,
+                on_retry=self._retry_reporter("Firecrawl search", span),
+                deadline=time.time() + timeout if timeout else None
+            )
+        except CircuitOpenError as e:
+            print(f"⚠️ {e}")
+            return self._create_empty_result()
+        except Exception as e:
+            error_msg = str(e).lower()
+            
+            if "json" in error_msg or "parse" in error_msg:
+                print(f"⚠️ Firecrawl response parsing error: {e}")
                 return self._create_empty_result()
             
-        return self._create_empty_result()
+            print(f"❌ Firecrawl search error: {e}")
+            return self._create_empty_result()
         
+        if result and result.data:
+            self._cache_set(cache_key, result)
+        return result
+        
+
+    def scrape_company_page(self, url: str, max_retries: int = 2, timeout: Optional[float] = None):
+        with self.profiler.span("firecrawl.scrape", "firecrawl", cache_hit=False, retries=0, bytes=0) as span:
+            result = self._scrape_company_page(url, max_retries, self._timeout(timeout), span)
+            span["bytes"] = len(getattr(result, "markdown", None) or "")
+            return result
 
-    def scrape_company_page(self, url: str, max_retries: int = 2):
-        for attempt in range(max_retries + 1):
-            try:
-                result = self.app.scrape_url(
+
+    def _scrape_company_page(self, url: str, max_retries: int, timeout: Optional[float], span: dict):
+        cache_key = make_key("scrape", normalize_url(url), ["markdown"])
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            span["cache_hit"] = True
+            return cached
+        
+        try:
+            result = self.scheduler.call(
+                "firecrawl",
+                lambda: self.app.scrape_url(
                     url,
-                    formats=["markdown"]
-                )
-                return result
-            except Exception as e:
-                error_msg = str(e).lower()
-                
-                if "502" in error_msg or "bad gateway" in error_msg:
-                    if attempt < max_retries:
-                        print(f"🔄 Scraping 502 error, retrying in {attempt + 1}s...")
-                        time.sleep(attempt + 1)
-                        continue
-                    else:
-                        print(f"⚠️ Scraping failed after {max_retries} retries: {url}")
-                        return None
-                    
-                    print(f"⚠️ Scraping error for {url}: {e}")
-                    return None
+                    formats=["markdown"],
+                    timeout=int(timeout * 1000) if timeout else None
+                ),
+                max_retries=max_retries,
+                on_retry=self._retry_reporter("Scraping", span),
+                deadline=time.time() + timeout if timeout else None
+            )
+        except Exception as e:
+            print(f"⚠️ Scraping error for {url}: {e}")
+            return None
+        
+        if result and result.markdown:
+            self._cache_set(cache_key, result)
+        return result
+    
+    
+    def resolve_content(self, hit: Dict[str, Any], timeout: Optional[float] = None) -> Optional[str]:
+        """Markdown for a search hit, scraping the URL only when the embedded copy is missing or too short"""
+        embedded = hit.get("markdown") or ""
+        with self.profiler.span("firecrawl.resolve", "firecrawl", scrape_avoided=False) as span:
+            if len(embedded) >= self.min_embedded_chars:
+                span["scrape_avoided"] = True
+                with self._stats_lock:
+                    self.content_stats["embedded"] += 1
+                return embedded
             
-        return None
+            with self._stats_lock:
+                self.content_stats["scraped"] += 1
+            scraped = self.scrape_company_page(hit.get("url", ""), timeout=timeout)
+            if scraped and scraped.markdown:
+                return scraped.markdown
+            return embedded or None
+    
+    
+    def _timeout(self, timeout: Optional[float]) -> Optional[float]:
+        if timeout is None:
+            return self.timeout
+        # An expired budget still gets a short timeout, since 0 would mean no timeout at all
+        return max(1.0, min(timeout, self.timeout or timeout))
+    
+    
+    def _retry_reporter(self, label: str, span: dict):
+        def report(attempt: int, error: Exception, delay: float):
+            span["retries"] = attempt
+            print(f"🔄 {label} error ({error}), retrying in {delay:.1f}s...")
+        return report
     
     
+    def _cache_get(self, key: str):
+        if self.cache is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            print(f"⚠️ Cache read failed: {e}")
+            return None
+
+
+    def _cache_set(self, key: str, value):
+        if self.cache is None:
+            return
+        try:
+            self.cache.set(key, value)
+        except Exception as e:
+            print(f"⚠️ Cache write failed: {e}")
+
+
     def _create_empty_result(self):
         class EmptyResult:
             def __init__(self):
@@ -0,0 +1,81 @@
+import threading
+from typing import Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from .config import Settings
+
+
+class HttpPool:
+    """Process-wide keep-alive requests Session for Firecrawl, with warm-up and pool metrics"""
+
+    _shared: Optional["HttpPool"] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, pool_size: int = 16):
+        self.pool_size = max(1, pool_size)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.counters = {"warmups": 0, "warmup_failures": 0}
+        self._warmed = set()
+        self._lock = threading.Lock()
+
+
+    @classmethod
+    def shared(cls, settings: Settings) -> "HttpPool":
+        """The process-wide pool; the first caller's settings size it"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(settings.http_pool_size)
+            return cls._shared
+
+
+    def warm_up(self, url: str):
+        """Open a connection to the API host in the background so the first query skips the TCP and TLS handshakes"""
+        with self._lock:
+            if url in self._warmed:
+                return
+            self._warmed.add(url)
+        threading.Thread(target=self._warm, args=(url,), name="http-warmup", daemon=True).start()
+
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self.counters)
+
+        firecrawl = {"requests": 0, "connections": 0, "idle": 0, "in_use": 0}
+        for adapter in {id(a): a for a in self.session.adapters.values()}.values():
+            for key in list(adapter.poolmanager.pools.keys()):
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:
+                    continue
+                firecrawl["requests"] += pool.num_requests
+                firecrawl["connections"] += pool.num_connections
+                # urllib3 keeps None placeholders in the queue for slots that were never filled
+                firecrawl["idle"] += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+                firecrawl["in_use"] += pool.pool.maxsize - pool.pool.qsize()
+
+        firecrawl["reuse_rate"] = round(1 - firecrawl["connections"] / firecrawl["requests"], 3) if firecrawl["requests"] else 0.0
+        firecrawl["utilization"] = round(firecrawl["in_use"] / self.pool_size, 3)
+        return {
+            "pool_size": self.pool_size,
+            "warmups": counters["warmups"],
+            "warmup_failures": counters["warmup_failures"],
+            "firecrawl": firecrawl,
+        }
+
+
+    def close(self):
+        self.session.close()
+
+
+    def _warm(self, url: str):
+        try:
+            # Any status will do, even 404; the point is a pooled, already-negotiated connection
+            self.session.head(url, timeout=10)
+            key = "warmups"
+        except Exception:
+            key = "warmup_failures"
+        with self._lock:
+            self.counters[key] += 1
@@ -1,70 +1,210 @@
-import time
-import threading
+import json
+import shutil
 import sys
-from typing import Optional
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+
+MODES = ("interactive", "plain", "quiet", "json")
 
 
 class ProgressLogger:
-    def __init__(self):
+    """Progress output with one renderer thread that animates a line per active task.
+
+    Modes: "interactive" redraws spinners in place (TTY only), "plain" prints one line per
+    step, "quiet" prints nothing and "json" writes one JSON object per event to stderr.
+    """
+
+    FRAME_INTERVAL = 0.1
+
+    def __init__(self, animate: bool = True, mode: Optional[str] = None):
+        if mode is None:
+            # Animation on a pipe or file is just noise, so non-TTY output stays silent
+            mode = ("interactive" if sys.stdout.isatty() else "quiet") if animate else "plain"
+        if mode not in MODES:
+            raise ValueError(f"Unknown logger mode {mode!r}, expected one of {', '.join(MODES)}")
+
+        self.mode = mode
         self.spinner_chars = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"
-        self.spinner_active = False
-        self.spinner_thread = None
-        self.current_message = ""
-    
-    
-    def start_spinner(self, message:str):
-        self.current_message = message
-        self.spinner_active = True
-        self.spinner_thread = threading.Thread(target=self._spin)
-        self.spinner_thread.daemon = True
-        self.spinner_thread.start()
-        
-    
-    def stop_spinner(self, completion_message: str =""):
-        if not self.spinner_active:
+        self.inline_text = False
+        self._tasks: Dict[str, Tuple[str, int]] = {}
+        self._drawn = 0
+        self._frame = 0
+        self._paused = 0
+        self._lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._renderer: Optional[threading.Thread] = None
+
+
+    @property
+    def animate(self) -> bool:
+        return self.mode == "interactive"
+
+
+    def start_spinner(self, message: str, task: str = "main"):
+        self.start_task(task, message)
+
+
+    def stop_spinner(self, completion_message: str = "", task: str = "main"):
+        self.end_task(task, completion_message)
+
+
+    def start_task(self, task: str, message: str, indent: int = 0):
+        """Show an animated line for task until end_task; concurrent tasks get a line each"""
+        if self.mode == "json":
+            self._emit_json("task_start", message, task=task)
+        if not self.animate:
             return
-        
-        self.spinner_active = False
-        if self.spinner_thread:
-            self.spinner_thread.join()
-        
-        sys.stdout.write('\r')
-        sys.stdout.write(' ' * 100) 
-        sys.stdout.write('\r')
-        sys.stdout.flush()
-        
-        time.sleep(0.02)
-        
-        if completion_message:
-            print(f"✓  {completion_message}")
+
+        with self._lock:
+            self._tasks[task] = (message, indent)
+            self._ensure_renderer()
+            self._redraw()
+            self._wake.notify()
+
+
+    def end_task(self, task: str, completion_message: str = ""):
+        if self.mode == "json":
+            self._emit_json("task_end", completion_message, task=task)
+            return
+        if self.mode == "plain":
+            if completion_message:
+                self._write_line(f"✓  {completion_message}")
+            return
+        if not self.animate:
+            return
+
+        with self._lock:
+            self._tasks.pop(task, None)
+            if completion_message:
+                self._write_line(f"✓  {completion_message}")
+            else:
+                self._redraw()
+
+
+    def clear_line(self):
+        """Erase the progress block so the caller can print; it is redrawn on the next frame"""
+        if not self.animate:
+            return
+        with self._lock:
+            sys.stdout.write(self._erase())
+            sys.stdout.flush()
+
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Hold the renderer while the caller prints its own output"""
+        if not self.animate:
+            yield
+            return
+        with self._lock:
+            self._paused += 1
+            sys.stdout.write(self._erase())
             sys.stdout.flush()
-        
-        
-    def _spin(self):
-        i = 0
-        while self.spinner_active:
-            if self.spinner_active:
-                sys.stdout.write(f"\r{self.spinner_chars[i % len(self.spinner_chars)]} {self.current_message}")
-                sys.stdout.flush()
-                time.sleep(0.1)
-                i += 1
-            
-    
+            try:
+                yield
+            finally:
+                self._paused -= 1
+                self._redraw()
+
+
+    def stream_text(self, text: str):
+        """Write streamed text inline; the next log line starts on a fresh line"""
+        if not self.animate:
+            return
+
+        with self._lock:
+            sys.stdout.write(self._erase() + text)
+            sys.stdout.flush()
+            self.inline_text = True
+
+
     def log_step(self, emoji: str, message: str):
-        sys.stdout.write("\r")
-        print(f"{emoji} {message}")
-        sys.stdout.flush()
-        
-    
+        self._log("step", f"{emoji} {message}", message)
+
+
     def log_substep(self, message: str, indent: int = 2):
-        print(f"{' ' * indent}→ {message}")
-    
-    
+        self._log("substep", f"{' ' * indent}→ {message}", message)
+
+
     def log_error(self, message: str, error: Exception = None):
-        print(f"❌ {message}")
-        if error:
-            print(f"   Details: {str(error)}")
+        text = f"❌ {message}" + (f"\n   Details: {str(error)}" if error else "")
+        self._log("error", text, message, error=str(error) if error else None)
 
 
     def log_warning(self, message: str):
-        print(f"⚠️  {message}")
\ No newline at end of file
+        self._log("warning", f"⚠️  {message}", message)
+
+
+    def _log(self, event: str, text: str, message: str, **extra):
+        if self.mode == "json":
+            self._emit_json(event, message, **extra)
+        elif self.mode != "quiet":
+            self._write_line(text)
+
+
+    def _emit_json(self, event: str, message: str, **extra):
+        record = {"time": round(time.time(), 3), "event": event, "message": message}
+        record.update({key: value for key, value in extra.items() if value is not None})
+        with self._lock:
+            sys.stderr.write(json.dumps(record) + "\n")
+            sys.stderr.flush()
+
+
+    def _write_line(self, text: str):
+        with self._lock:
+            if not self.animate:
+                print(text)
+                return
+            sys.stdout.write(self._erase() + self._end_inline_text() + text + "\n" + self._block())
+            sys.stdout.flush()
+
+
+    def _end_inline_text(self) -> str:
+        if self.inline_text:
+            self.inline_text = False
+            return "\n"
+        return ""
+
+
+    def _ensure_renderer(self):
+        if self._renderer is None:
+            self._renderer = threading.Thread(target=self._render_loop, name="progress", daemon=True)
+            self._renderer.start()
+
+
+    def _render_loop(self):
+        with self._wake:
+            while True:
+                while not self._tasks:
+                    self._wake.wait()
+                self._frame += 1
+                self._redraw()
+                self._wake.wait(self.FRAME_INTERVAL)
+
+
+    def _redraw(self):
+        # Caller holds the lock; one write and one flush per frame
+        sys.stdout.write(self._erase() + self._block())
+        sys.stdout.flush()
+
+
+    def _erase(self) -> str:
+        if not self._drawn:
+            return ""
+        lines, self._drawn = self._drawn, 0
+        return f"\x1b[{lines}F\x1b[J"
+
+
+    def _block(self) -> str:
+        if self._paused or self.inline_text or not self._tasks:
+            return ""
+        width = max(20, shutil.get_terminal_size().columns - 1)
+        lines = []
+        for i, (message, indent) in enumerate(self._tasks.values()):
+            frame = self.spinner_chars[(self._frame + i) % len(self.spinner_chars)]
+            lines.append(f"{' ' * indent}{frame} {message}"[:width])
+        self._drawn = len(lines)
+        return "".join(f"\x1b[2K{line}\n" for line in lines)
@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict, Any
+import operator
+from typing import Annotated, List, Optional, Dict, Any
 from pydantic import BaseModel
 
 
@@ -11,8 +12,25 @@ class CompanyAnalysis(BaseModel):
     api_available: Optional[bool] = None
     language_support: List[str] = []
     integration_capabilities: List[str] = []
+
+
+class NamedCompanyAnalysis(CompanyAnalysis):
+    """CompanyAnalysis tagged with the tool it describes"""
+    name: str
+
+
+class BatchCompanyAnalysis(BaseModel):
+    """Structured output for analyzing several tools in one LLM call"""
+    analyses: List[NamedCompanyAnalysis] = []
     
 
+class ContentRef(BaseModel):
+    """Pointer to scraped content in the blob store, with a short excerpt for display"""
+    digest: str
+    size: int = 0
+    excerpt: str = ""
+
+
 class CompanyInfo(BaseModel):
     name: str
     description: str
@@ -25,12 +43,17 @@ class CompanyInfo(BaseModel):
     language_support: List[str] = []
     integration_capabilities: List[str] = []
     developer_experience_rating: Optional[str] = None
+    content: Optional[ContentRef] = None
     
     
 class ResearchState(BaseModel):
     query: str
+    category_info: Dict[str, Any] = {}
+    articles: List[ContentRef] = []
     extracted_tools: List[str] = []
     companies: List[CompanyInfo] = []
     search_results: List[Dict[str, Any]] = []
     analysis: Optional[str] = None
+    # Fields cut short by the query deadline; companies left unanalyzed have no pricing_model
+    partial: Annotated[List[str], operator.add] = []
     
\ No newline at end of file
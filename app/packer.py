@@ -0,0 +1,180 @@
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+HEADING = re.compile(r"^#{1,6}\s+\S")
+LINK = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+BOILERPLATE = re.compile(
+    r"cookie|all rights reserved|privacy policy|terms of (service|use)|skip to (main )?content"
+    r"|^(sign in|log in|sign up|subscribe|share|menu|toggle navigation)\b",
+    re.IGNORECASE,
+)
+WORD = re.compile(r"[a-z0-9+#.]+")
+
+ANALYSIS_KEYWORDS: Dict[str, float] = {
+    "pricing": 3.0, "price": 2.5, "plan": 1.5, "free": 1.5, "enterprise": 1.5, "$": 1.5,
+    "api": 3.0, "sdk": 3.0, "rest": 1.5, "graphql": 1.5, "cli": 1.0,
+    "integration": 2.5, "integrates": 2.5, "github": 1.0, "docker": 1.0,
+    "python": 1.5, "javascript": 1.5, "typescript": 1.5, "go": 1.0, "java": 1.0, "language": 2.0,
+    "open source": 2.5, "license": 2.0, "self-host": 1.5, "features": 1.0,
+}
+
+EXTRACTION_KEYWORDS: Dict[str, float] = {
+    "alternative": 2.0, "alternatives": 2.0, "best": 1.5, "top": 1.5, "vs": 1.5,
+    "compared": 1.0, "comparison": 1.0, "options": 1.0, "choice": 1.0,
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English markdown)"""
+    return math.ceil(len(text) / 4)
+
+
+@dataclass
+class Section:
+    heading: str
+    body: str
+    position: int
+    document: int = 0
+    score: float = 0.0
+
+
+    @property
+    def text(self) -> str:
+        return f"{self.heading}\n{self.body}".strip()
+
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def clean_markdown(markdown: str) -> str:
+    """Drop navigation bars, images and footer/cookie boilerplate, keeping link text"""
+    lines = []
+    for line in markdown.splitlines():
+        stripped = IMAGE.sub("", line).strip()
+        links = LINK.findall(stripped)
+        plain = LINK.sub("", stripped).strip(" |•·-*")
+        if len(links) >= 2 and len(plain) < 20:
+            continue
+        if BOILERPLATE.search(LINK.sub(lambda m: m.group(1), stripped)) and len(stripped) < 160:
+            continue
+        lines.append(LINK.sub(lambda m: m.group(1), stripped) if stripped else "")
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def split_sections(markdown: str, max_tokens: int = 300) -> List[Section]:
+    """Split on markdown headings; oversized sections are split further on paragraph breaks"""
+    sections: List[Section] = []
+    heading, body = "", []
+
+    def flush():
+        paragraphs = [p.strip() for p in "\n".join(body).split("\n\n") if p.strip()]
+        chunk: List[str] = []
+        for paragraph in paragraphs:
+            if chunk and estimate_tokens("\n\n".join(chunk + [paragraph])) > max_tokens:
+                sections.append(Section(heading, "\n\n".join(chunk), len(sections)))
+                chunk = []
+            chunk.append(paragraph)
+        if chunk or heading:
+            sections.append(Section(heading, "\n\n".join(chunk), len(sections)))
+
+    for line in markdown.splitlines():
+        if HEADING.match(line):
+            flush()
+            heading, body = line.strip(), []
+        else:
+            body.append(line)
+    flush()
+    return sections
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut text to the budget, preferring a paragraph, then sentence, then word boundary"""
+    if estimate_tokens(text) <= budget:
+        return text
+    limit = max(0, budget * 4)
+    cut = text[:limit]
+    for separator in ("\n\n", ". ", "\n", " "):
+        index = cut.rfind(separator)
+        if index > limit // 2:
+            return cut[:index + (1 if separator == ". " else 0)].rstrip()
+    return cut.rstrip()
+
+
+class ContentPacker:
+    """Fills a token budget with the most relevant sections of scraped markdown, without an LLM call"""
+
+    def __init__(self, keywords: Dict[str, float], min_fragment_tokens: int = 40, headings_first: bool = False):
+        self.keywords = keywords
+        self.min_fragment_tokens = min_fragment_tokens
+        # List-style articles name each tool in a heading, so headings alone carry most of the signal
+        self.headings_first = headings_first
+
+
+    def pack(self, markdown: str, budget: int, query: Optional[str] = None) -> str:
+        return self.pack_many([markdown], budget, query)
+
+
+    def pack_many(self, documents: Iterable[str], budget: int, query: Optional[str] = None) -> str:
+        """Pack several documents into one budget; earlier documents win ties, output keeps source order"""
+        sections: List[Section] = []
+        for document, markdown in enumerate(documents):
+            for section in split_sections(clean_markdown(markdown or "")):
+                section.document = document
+                section.score = self._score(section, query) / (1 + 0.1 * document)
+                sections.append(section)
+
+        chosen: Dict[Tuple[int, int], Section] = {}
+        remaining = budget
+        if self.headings_first:
+            for section in sections:
+                cost = estimate_tokens(section.heading)
+                if section.heading and cost <= remaining:
+                    chosen[(section.document, section.position)] = Section(section.heading, "", section.position, section.document)
+                    remaining -= cost
+
+        for section in sorted(sections, key=lambda s: (-s.score, s.document, s.position)):
+            if remaining < self.min_fragment_tokens:
+                break
+            key = (section.document, section.position)
+            reserved = chosen[key].tokens if key in chosen else 0
+            if section.tokens - reserved <= remaining:
+                chosen[key] = section
+                remaining -= section.tokens - reserved
+            elif section.score > 0:
+                text = truncate_to_tokens(section.text, remaining + reserved)
+                if estimate_tokens(text) > reserved:
+                    chosen[key] = Section("", text, section.position, section.document)
+                    remaining -= estimate_tokens(text) - reserved
+
+        parts, current = [], None
+        for section in (chosen[key] for key in sorted(chosen)):
+            if current is not None and section.document != current:
+                parts.append("---")
+            parts.append(section.text)
+            current = section.document
+        return "\n\n".join(parts)
+
+
+    def _score(self, section: Section, query: Optional[str]) -> float:
+        heading = section.heading.lower()
+        body = section.body.lower()
+        words = WORD.findall(body)
+        score = 0.0
+        for keyword, weight in self.keywords.items():
+            count = body.count(keyword) if " " in keyword or not keyword.isalnum() else words.count(keyword)
+            score += weight * (min(count, 3) + (3 if keyword in heading else 0))
+        if query:
+            for term in set(WORD.findall(query.lower())):
+                if len(term) > 2:
+                    score += 2.0 * (min(words.count(term), 3) + (3 if term in heading else 0))
+        if section.position == 0:
+            # The lead section usually says what the product is
+            score += 4.0
+        # Prefer dense sections over long ones that mention a keyword once
+        return score / math.sqrt(max(section.tokens, 1) / 50 + 1)
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+
+class Profiler:
+    """Collects timing spans for graph nodes, Firecrawl calls and LLM calls
+
+    Only the newest max_spans are kept, so a long-running server does not grow without bound;
+    mark() returns a position that summary(since=...) accepts even after older spans are dropped.
+    """
+
+    def __init__(self, enabled: bool = True, max_spans: int = 20000):
+        self.enabled = enabled
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+
+    @contextmanager
+    def span(self, name: str, category: str, **attrs) -> Iterator[Dict[str, Any]]:
+        """Time the enclosed block; callers can add counters to the yielded attrs dict"""
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except Exception as e:
+            attrs["error"] = str(e)
+            raise
+        finally:
+            self.record(name, category, start, time.perf_counter(), attrs)
+
+
+    def wrap(self, name: str, category: str, func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.span(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+    def record(self, name: str, category: str, start: float, end: float, attrs: Optional[Dict[str, Any]] = None):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "cat": category,
+                "start": start - self._origin,
+                "duration": end - start,
+                "thread": threading.get_ident(),
+                "attrs": attrs or {},
+            })
+            self.recorded += 1
+
+
+    def mark(self) -> int:
+        with self._lock:
+            return self.recorded
+
+
+    def reset(self):
+        with self._lock:
+            self.spans.clear()
+            self.recorded = 0
+            self._origin = time.perf_counter()
+
+
+    def summary(self, since: int = 0) -> List[Dict[str, Any]]:
+        """Aggregate spans per name: call count, total/mean/max seconds and summed numeric attrs"""
+        groups: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            spans = list(self.spans)[len(self.spans) - min(len(self.spans), self.recorded - since):]
+
+        for span in spans:
+            group = groups.setdefault(span["name"], {
+                "name": span["name"],
+                "cat": span["cat"],
+                "count": 0,
+                "total": 0.0,
+                "max": 0.0,
+                "errors": 0,
+                "counters": defaultdict(int),
+            })
+            group["count"] += 1
+            group["total"] += span["duration"]
+            group["max"] = max(group["max"], span["duration"])
+            if "error" in span["attrs"]:
+                group["errors"] += 1
+            for key, value in span["attrs"].items():
+                if isinstance(value, bool):
+                    group["counters"][key] += int(value)
+                elif isinstance(value, (int, float)):
+                    group["counters"][key] += value
+
+        rows = []
+        for group in groups.values():
+            group["mean"] = group["total"] / group["count"]
+            group["counters"] = dict(group["counters"])
+            rows.append(group)
+        return sorted(rows, key=lambda row: (row["cat"] != "node", -row["total"]))
+
+
+    def format_summary(self, since: int = 0) -> str:
+        lines = [f"{'stage':<22}{'calls':>6}{'total':>10}{'mean':>10}{'max':>10}  counters"]
+        for row in self.summary(since):
+            counters = ", ".join(f"{key}={value}" for key, value in row["counters"].items())
+            lines.append(
+                f"{row['name']:<22}{row['count']:>6}{row['total']:>9.2f}s{row['mean']:>9.2f}s{row['max']:>9.2f}s  {counters}"
+            )
+        return "\n".join(lines)
+
+
+    def export_jsonl(self, path: str):
+        with self._lock:
+            spans = list(self.spans)
+        with open(path, "w", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span, default=str) + "\n")
+
+
+    def export_chrome_trace(self, path: str):
+        """Write spans in the Trace Event format understood by chrome://tracing and Perfetto"""
+        pid = os.getpid()
+        with self._lock:
+            events = [
+                {
+                    "name": span["name"],
+                    "cat": span["cat"],
+                    "ph": "X",
+                    "ts": span["start"] * 1e6,
+                    "dur": span["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": span["thread"],
+                    "args": span["attrs"],
+                }
+                for span in self.spans
+            ]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+    def export(self, path: str):
+        if path.endswith(".jsonl"):
+            self.export_jsonl(path)
+        else:
+            self.export_chrome_trace(path)
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 
 class DeveloperToolsPrompts:
@@ -36,7 +36,7 @@ class DeveloperToolsPrompts:
         
         return f"""Query: {query}
 
-        Article Content: {content[:3000]}
+        Article Content: {content}
 
         Extract ONLY specific {category} mentioned in this content.
 
@@ -61,7 +61,7 @@ class DeveloperToolsPrompts:
     @staticmethod
     def tool_analysis_user(company_name: str, content: str) -> str:
         return f"""Company/Tool: {company_name}
-                Website Content: {content[:2500]}
+                Website Content: {content}
 
                 Analyze this content from a developer's perspective and provide:
                 - pricing_model: One of "Free", "Paid", "Enterprise", or "Unknown"
@@ -75,6 +75,28 @@ class DeveloperToolsPrompts:
                 Focus on developer-relevant features like APIs, SDKs, language support, integrations, and development workflows."""
 
 
+    @staticmethod
+    def tool_batch_analysis_user(items: List[Tuple[str, str]]) -> str:
+        pages = "\n\n".join(
+            f"=== Company/Tool: {name} ===\nWebsite Content: {content}"
+            for name, content in items
+        )
+        names = ", ".join(name for name, _ in items)
+        return f"""{pages}
+
+                Analyze each tool above ({names}) from a developer's perspective.
+                Return one entry per tool in "analyses", with "name" set exactly to the tool name given above, and:
+                - pricing_model: One of "Free", "Paid", "Enterprise", or "Unknown"
+                - is_open_source: true if open source, false if proprietary, null if unclear
+                - tech_stack: List of programming languages, frameworks, databases, APIs, or technologies supported/used
+                - description: Brief 1-sentence description focusing on what this tool does for developers
+                - api_available: true if REST API, GraphQL, SDK, or programmatic access is mentioned
+                - language_support: List of programming languages explicitly supported (e.g., Python, JavaScript, Go, etc.)
+                - integration_capabilities: List of tools/platforms it integrates with (e.g., GitHub, VS Code, Docker, AWS, etc.)
+
+                Base each entry only on that tool's own content."""
+
+
     # Recommendation prompts
     RECOMMENDATIONS_SYSTEM = """You are a senior software engineer providing quick, concise tech recommendations. 
                             Keep responses brief and actionable - maximum 3-4 sentences total."""
@@ -83,7 +105,7 @@ class DeveloperToolsPrompts:
     @staticmethod
     def recommendations_user(query: str, company_data: str) -> str:
         return f"""Developer Query: {query}
-                Tools/Technologies Analyzed: {company_data[:2000]}
+                Tools/Technologies Analyzed: {company_data}
 
                 Provide a brief recommendation (3-4 sentences max) covering:
                 - Which tool is best and why
@@ -0,0 +1,159 @@
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .cache import ContentCache, make_key
+from .models import ResearchState
+
+
+TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+STOP_WORDS = {
+    "a", "an", "the", "to", "for", "of", "in", "on", "with", "and", "or", "like", "than", "vs", "versus",
+    "what", "which", "are", "is", "there", "any", "some", "me", "my", "i", "we", "can", "should", "that",
+    "good", "better", "best", "top", "similar", "other", "instead", "recommend", "recommendation", "suggest",
+}
+# Category words shape the question far less than the named tool does
+GENERIC_TERMS = {
+    "alternative", "tool", "framework", "library", "platform", "service", "app", "application",
+    "option", "software", "solution", "product", "database", "provider", "developer",
+}
+GENERIC_WEIGHT = 0.3
+PREFIX = "query:"
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith(("sses", "xes", "ches", "shes")):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def query_terms(query: str) -> List[str]:
+    """Lowercased, stemmed tokens with stop words removed, e.g. "alternatives to React" -> ["alternative", "react"]"""
+    tokens = (_stem(token.rstrip(".")) for token in TOKEN.findall(query.lower()))
+    return [token for token in tokens if token and token not in STOP_WORDS]
+
+
+def canonical_query(query: str) -> str:
+    """Query terms in their original order, repeats dropped; "migrate MySQL to Postgres" and its reverse differ"""
+    return " ".join(dict.fromkeys(query_terms(query)))
+
+
+def same_order(terms: List[str], other: List[str]) -> bool:
+    """Whether the specific (non-generic) terms both queries share appear in the same order in each"""
+    shared = (set(terms) & set(other)) - GENERIC_TERMS
+    return [term for term in terms if term in shared] == [term for term in other if term in shared]
+
+
+class QueryCache:
+    """Finished ResearchState results keyed by query, matched exactly or by weighted TF-IDF cosine similarity"""
+
+    def __init__(self, cache: ContentCache, threshold: float = 0.85):
+        self.cache = cache
+        self.threshold = threshold
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+
+    def get(self, query: str) -> Optional[Tuple[ResearchState, str, float]]:
+        """Return (state, cached query, similarity) for the closest fresh match, or None"""
+        canonical = canonical_query(query)
+        if not canonical:
+            return None
+
+        match = self._load(make_key("query", canonical))
+        if match:
+            self._count("exact_hits")
+            return match[0], match[1], 1.0
+
+        best_key, best_score = None, 0.0
+        entries = self.cache.tagged(PREFIX)
+        documents = {tag[len(PREFIX):]: key for tag, key in entries}
+        if documents:
+            idf = self._idf(list(documents) + [canonical])
+            terms = canonical.split()
+            target = self._vector(terms, idf)
+            for text, key in documents.items():
+                # Similarity ignores order, but the same tools swapped around ask a different question
+                if not same_order(terms, text.split()):
+                    continue
+                score = self._cosine(target, self._vector(text.split(), idf))
+                if score > best_score:
+                    best_key, best_score = key, score
+
+        if best_key and best_score >= self.threshold:
+            match = self._load(best_key)
+            if match:
+                self._count("fuzzy_hits")
+                return match[0], match[1], best_score
+
+        self._count("misses")
+        return None
+
+
+    def put(self, query: str, state: ResearchState):
+        canonical = canonical_query(query)
+        if not canonical:
+            return
+        self.cache.set(
+            make_key("query", canonical),
+            {"query": query, "state": state.model_dump(), "stored_at": time.time()},
+            tag=PREFIX + canonical
+        )
+
+
+    def clear(self):
+        for _, key in self.cache.tagged(PREFIX):
+            self.cache.invalidate(key)
+
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.exact_hits + self.fuzzy_hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.exact_hits + self.fuzzy_hits) / lookups, 3) if lookups else 0.0,
+            }
+
+
+    def _load(self, key: str) -> Optional[Tuple[ResearchState, str]]:
+        data = self.cache.get(key)
+        if data is None:
+            return None
+        return ResearchState(**data["state"]), data["query"]
+
+
+    def _count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+    @staticmethod
+    def _idf(documents: List[str]) -> Dict[str, float]:
+        frequency = Counter(term for document in documents for term in set(document.split()))
+        total = len(documents)
+        return {term: math.log((total + 1) / (count + 1)) + 1 for term, count in frequency.items()}
+
+
+    @staticmethod
+    def _vector(terms: List[str], idf: Dict[str, float]) -> Dict[str, float]:
+        return {
+            term: idf.get(term, 1.0) * (GENERIC_WEIGHT if term in GENERIC_TERMS else 1.0)
+            for term in terms
+        }
+
+
+    @staticmethod
+    def _cosine(left: Dict[str, float], right: Dict[str, float]) -> float:
+        dot = sum(weight * right.get(term, 0.0) for term, weight in left.items())
+        norm = math.sqrt(sum(w * w for w in left.values())) * math.sqrt(sum(w * w for w in right.values()))
+        return dot / norm if norm else 0.0
@@ -0,0 +1,223 @@
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import httpx
+import requests
+
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+THROTTLE_STATUS = {429, 529}
+TRANSIENT_HINTS = ("bad gateway", "rate limit", "overloaded", "timed out", "timeout", "temporarily unavailable", "connection")
+# Network failures below the HTTP layer; their messages carry URLs and ports, never a status
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, httpx.TransportError)
+# Only a number introduced as a status counts; a bare 443 in "port=443" is not one
+STATUS_PATTERN = re.compile(r"\b(?:status|error) code:? ([45]\d\d)\b")
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+
+@dataclass
+class ProviderPolicy:
+    rate: float = 5.0
+    burst: int = 10
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class TokenBucket:
+    """Token bucket whose refill rate halves on throttling and creeps back on success (AIMD)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
+
+
+    def throttle(self):
+        with self._lock:
+            self.rate = max(self.max_rate / 16, self.rate / 2)
+
+
+    def recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets a single probe through once reset_timeout passes"""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probing:
+                self.probing = True
+                return True
+            return False
+
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+def classify_error(error: Exception) -> Tuple[bool, bool, Optional[float]]:
+    """Return (retryable, throttled, retry_after_seconds) for a provider exception"""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    message = str(error).lower()
+
+    if status is None and isinstance(error, TRANSIENT_ERRORS):
+        return True, False, None
+    if status is None:
+        match = STATUS_PATTERN.search(message)
+        status = int(match.group(1)) if match else None
+
+    retry_after = None
+    headers = getattr(response, "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after")
+        try:
+            retry_after = float(value) if value is not None else None
+        except ValueError:
+            retry_after = None
+
+    throttled = status in THROTTLE_STATUS or "rate limit" in message or "overloaded" in message
+    if status is not None:
+        return status in RETRYABLE_STATUS, throttled, retry_after
+    return any(hint in message for hint in TRANSIENT_HINTS), throttled, retry_after
+
+
+class Scheduler:
+    """Shared rate limiting, retry with backoff and circuit breaking for outbound provider calls"""
+
+    def __init__(self, policies: Dict[str, ProviderPolicy]):
+        self.policies = policies
+        self._buckets = {name: TokenBucket(p.rate, p.burst) for name, p in policies.items()}
+        self._breakers = {name: CircuitBreaker(p.failure_threshold, p.reset_timeout) for name, p in policies.items()}
+        self._counters = {name: dict.fromkeys(
+            ("calls", "successes", "failures", "retries", "throttled", "rejected"), 0
+        ) for name in policies}
+        self._lock = threading.Lock()
+
+
+    def call(
+        self,
+        provider: str,
+        fn: Callable[[], Any],
+        max_retries: Optional[int] = None,
+        on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+        deadline: Optional[float] = None
+    ) -> Any:
+        policy = self.policies[provider]
+        bucket = self._buckets[provider]
+        breaker = self._breakers[provider]
+        retries = policy.max_retries if max_retries is None else max_retries
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                self._count(provider, "rejected")
+                raise CircuitOpenError(f"{provider} circuit is open after repeated failures")
+
+            bucket.acquire()
+            self._count(provider, "calls")
+            try:
+                result = fn()
+            except Exception as e:
+                retryable, throttled, retry_after = classify_error(e)
+                if throttled:
+                    bucket.throttle()
+                    self._count(provider, "throttled")
+                if retryable:
+                    breaker.record_failure()
+                else:
+                    # The provider answered; a bad request says nothing about its health
+                    breaker.record_success()
+
+                backoff = min(policy.max_delay, policy.base_delay * (2 ** attempt))
+                delay = retry_after if retry_after is not None else backoff / 2 + random.uniform(0, backoff / 2)
+                # A retry that cannot finish before the caller's deadline is not worth waiting for
+                if not retryable or attempt >= retries or (deadline is not None and time.time() + delay >= deadline):
+                    self._count(provider, "failures")
+                    raise
+
+                self._count(provider, "retries")
+                if on_retry:
+                    on_retry(attempt + 1, e, delay)
+                time.sleep(delay)
+                continue
+
+            breaker.record_success()
+            bucket.recover()
+            self._count(provider, "successes")
+            return result
+
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            snapshot = {name: dict(counters) for name, counters in self._counters.items()}
+        for name, counters in snapshot.items():
+            counters["circuit"] = self._breakers[name].state
+            counters["rate"] = round(self._buckets[name].rate, 3)
+            counters["waited"] = round(self._buckets[name].waited, 3)
+        return snapshot
+
+
+    def _count(self, provider: str, key: str):
+        with self._lock:
+            self._counters[provider][key] += 1
@@ -0,0 +1,238 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+from .cache import normalize_query
+
+
+MAX_BODY_BYTES = 64 * 1024
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+    429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ResearchServer:
+    """JSON API over one shared Workflow: identical in-flight queries run once, excess load gets 429"""
+
+    def __init__(self, workflow, workers: int = 4, queue_size: int = 32, request_timeout: float = 300.0):
+        self.workflow = workflow
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.request_timeout = request_timeout
+        self.started_at = time.time()
+        self.counters = dict.fromkeys(("requests", "runs", "coalesced", "rejected", "completed", "failed", "timeouts"), 0)
+        self.latencies = deque(maxlen=500)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="research")
+        self._tasks = []
+        self._running = 0
+
+
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+
+    async def serve(self, host: str, port: int):
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+    async def research(self, query: str) -> Tuple[Any, bool]:
+        """Return (ResearchState, coalesced) for a query, joining an identical run already in flight"""
+        key = normalize_query(query)
+        future = self._inflight.get(key)
+        coalesced = future is not None
+
+        if coalesced:
+            self.counters["coalesced"] += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            try:
+                self._queue.put_nowait((query, future))
+            except asyncio.QueueFull:
+                self.counters["rejected"] += 1
+                raise HTTPError(429, "Research queue is full, retry shortly", {"Retry-After": "5"})
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+
+        try:
+            # Shield so one caller timing out does not cancel the run other callers are waiting on
+            state = await asyncio.wait_for(asyncio.shield(future), self.request_timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise HTTPError(504, "Research did not finish in time")
+        return state, coalesced
+
+
+    def _finish(self, key: str, future: asyncio.Future):
+        self._inflight.pop(key, None)
+        if not future.cancelled():
+            # Mark the error as retrieved even if every waiter already timed out
+            future.exception()
+
+
+    def metrics(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        metrics = {
+            **self.counters,
+            "in_flight": len(self._inflight),
+            "running": self._running,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "queue_size": self.queue_size,
+            "workers": self.workers,
+            "latency_p50": ordered[len(ordered) // 2] if ordered else 0.0,
+            "latency_p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] if ordered else 0.0,
+            "scheduler": self.workflow.scheduler.metrics(),
+            "http": self.workflow.http.metrics(),
+        }
+        if self.workflow.query_cache:
+            metrics["query_cache"] = self.workflow.query_cache.stats()
+        if self.workflow.rule_extractor:
+            metrics["rule_extraction"] = self.workflow.rule_extractor.stats()
+        if self.workflow.tool_index:
+            metrics["tool_index"] = self.workflow.tool_index.stats()
+        if self.workflow.speculation:
+            metrics["speculation"] = self.workflow.speculation.stats()
+        return metrics
+
+
+    def health(self) -> Dict[str, Any]:
+        circuits = {name: provider["circuit"] for name, provider in self.workflow.scheduler.metrics().items()}
+        degraded = any(state == "open" for state in circuits.values())
+        return {
+            "status": "degraded" if degraded else "ok",
+            "uptime": round(time.time() - self.started_at, 1),
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "circuits": circuits,
+        }
+
+
+    async def _worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            query, future = await self._queue.get()
+            self._running += 1
+            self.counters["runs"] += 1
+            started = time.perf_counter()
+            try:
+                state = await loop.run_in_executor(self._executor, self.workflow.run, query)
+            except Exception as e:
+                self.counters["failed"] += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.counters["completed"] += 1
+                self.latencies.append(round(time.perf_counter() - started, 3))
+                if not future.done():
+                    future.set_result(state)
+            finally:
+                self._running -= 1
+                self._queue.task_done()
+
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status, body, headers = await self._dispatch(reader)
+        except HTTPError as e:
+            status, body, headers = e.status, {"error": str(e)}, e.headers
+        except Exception as e:
+            status, body, headers = 500, {"error": str(e)}, {}
+
+        payload = json.dumps(body, default=str).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Content-Type: application/json",
+                f"Content-Length: {len(payload)}", "Connection: close"]
+        head.extend(f"{name}: {value}" for name, value in headers.items())
+        try:
+            writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + payload)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> Tuple[int, Any, Dict[str, str]]:
+        method, path, body = await self._read_request(reader)
+        route = urlsplit(path).path.rstrip("/") or "/"
+
+        if route in {"/health", "/healthz"}:
+            return 200, self.health(), {}
+        if route == "/metrics":
+            return 200, self.metrics(), {}
+        if route != "/research":
+            raise HTTPError(404, f"Unknown path {route}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST /research", {"Allow": "POST"})
+
+        try:
+            request = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            raise HTTPError(400, "Body must be JSON")
+        query = request.get("query") if isinstance(request, dict) else None
+        if not isinstance(query, str) or not query.strip():
+            raise HTTPError(400, 'Body must include a non-empty "query"')
+
+        self.counters["requests"] += 1
+        started = time.perf_counter()
+        try:
+            state, coalesced = await self.research(query.strip())
+        except HTTPError:
+            raise
+        except Exception as e:
+            raise HTTPError(500, f"Research failed: {e}")
+        return 200, {
+            "query": query,
+            "coalesced": coalesced,
+            "elapsed": round(time.perf_counter() - started, 3),
+            "state": state.model_dump(),
+        }, {}
+
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return parts[0].upper(), parts[1], body
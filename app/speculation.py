@@ -0,0 +1,99 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .deadline import Deadline
+from .models import CompanyInfo
+from .tool_index import tool_key
+
+
+# research(name, cancelled, deadline=...) for one guessed tool
+Research = Callable[..., Optional[CompanyInfo]]
+
+
+class Speculation:
+    """Researches likely tools in the background before extraction has named them
+
+    start() submits the guesses for a run; claim() hands back the ones that match the final
+    tool list and cancels the rest. Guesses that are already running are told to stop through
+    their Event, which the research function checks before its LLM analysis, and are bounded
+    by the deadline of the run that started them.
+    """
+
+    def __init__(self, research: Research, workers: int = 4):
+        self.research = research
+        self.workers = max(1, workers)
+        self.counters = Counter()
+        self._runs: Dict[str, Dict[str, Tuple[str, Future, threading.Event]]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+
+    def start(self, run_key: str, names: Iterable[str], deadline: Optional[Deadline] = None):
+        """Research names in the background for the run; run_key must be unique among runs in flight"""
+        self.discard(run_key)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="speculate")
+            tasks = {}
+            for name in names:
+                key = tool_key(name)
+                if not key or key in tasks:
+                    continue
+                cancelled = threading.Event()
+                tasks[key] = (name, self._executor.submit(self.research, name, cancelled, deadline=deadline), cancelled)
+            self._runs[run_key] = tasks
+            self.counters["started"] += len(tasks)
+
+
+    def claim(self, run_key: str, names: List[str]) -> Dict[str, Future]:
+        """Futures for the names that were guessed; every other guess for the run is cancelled"""
+        with self._lock:
+            tasks = self._runs.pop(run_key, {})
+        wanted = {tool_key(name): name for name in names}
+        claimed = {}
+        for key, (_, future, cancelled) in tasks.items():
+            if key in wanted:
+                claimed[wanted[key]] = future
+            else:
+                self._cancel(future, cancelled)
+        with self._lock:
+            self.counters["reused"] += len(claimed)
+        return claimed
+
+
+    def discard(self, run_key: str):
+        with self._lock:
+            tasks = self._runs.pop(run_key, {})
+        for _, future, cancelled in tasks.values():
+            self._cancel(future, cancelled)
+
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            started = self.counters["started"]
+            return {
+                "started": started,
+                "reused": self.counters["reused"],
+                "cancelled": self.counters["cancelled"],
+                "hit_rate": round(self.counters["reused"] / started, 3) if started else 0.0,
+            }
+
+
+    def shutdown(self):
+        with self._lock:
+            runs, self._runs = list(self._runs.values()), {}
+            executor, self._executor = self._executor, None
+        for tasks in runs:
+            for _, future, cancelled in tasks.values():
+                self._cancel(future, cancelled)
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+    def _cancel(self, future: Future, cancelled: threading.Event):
+        cancelled.set()
+        # Queued guesses never start; running ones stop before their LLM call
+        future.cancel()
+        with self._lock:
+            self.counters["cancelled"] += 1
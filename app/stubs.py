@@ -0,0 +1,333 @@
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional
+from firecrawl.firecrawl import ScrapeResponse, SearchResponse
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+from .cache import normalize_query, normalize_url
+from .prompts import DeveloperToolsPrompts
+
+
+TOOL_POOL = [
+    "Vercel", "Netlify", "Render", "Railway", "Fly.io", "Heroku",
+    "Pinecone", "Weaviate", "Qdrant", "ChromaDB", "Milvus",
+    "PostgreSQL", "MySQL", "MongoDB", "Supabase", "PlanetScale",
+    "Svelte", "Vue", "Angular", "SolidJS", "Preact",
+]
+
+
+def _seed(text: str) -> int:
+    return int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+
+
+def _pick_tools(text: str, count: int) -> List[str]:
+    rng = random.Random(_seed(normalize_query(text)))
+    return rng.sample(TOOL_POOL, count)
+
+
+def _slug(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum()) or "tool"
+
+
+def _tool_page(name: str) -> str:
+    return f"""# {name}
+
+[Home](/) [Docs](/docs) [Pricing](/pricing) [Blog](/blog) [Sign in](/login)
+
+{name} is a developer platform for building and shipping applications.
+
+## Features
+
+{name} gives teams preview environments for every pull request, instant rollbacks, built-in
+observability and global edge caching. Builds run in isolated containers with dependency caching,
+so most deploys finish in under a minute. Environment variables, secrets and custom domains are
+managed per project, and role-based access control keeps production changes auditable.
+
+## Why developers choose {name}
+
+- Zero-config defaults for popular frameworks, with escape hatches when you need them
+- Predictable pricing that scales from hobby projects to enterprise workloads
+- First-class CLI and dashboard, plus webhooks for every deployment event
+- Active community, extensive guides and responsive support
+
+## Pricing
+
+| Plan | Price |
+|------|-------|
+| Free | $0 / month |
+| Pro | $20 / month |
+| Enterprise | Contact sales |
+
+## API and SDKs
+
+{name} offers a REST API and official SDKs for Python, JavaScript, TypeScript and Go.
+
+## Integrations
+
+Works with GitHub, GitLab, VS Code, Docker and AWS.
+
+Licensed under the Apache 2.0 license. Source code on GitHub.
+
+© 2025 {name}. All rights reserved. Privacy Policy. Terms of Service.
+"""
+
+
+def _article(query: str, source: int = 0) -> str:
+    # Every source syndicates the same listicle under its own intro, like real comparison blogs
+    tools = _pick_tools(query, 6)
+    sections = "\n\n".join(
+        f"## {i}. {tool}\n\n{tool} is a popular choice with a generous free tier and a strong ecosystem. "
+        f"Teams pick {tool} for its documentation, SDK coverage and straightforward migration path."
+        for i, tool in enumerate(tools, 1)
+    )
+    return f"# Best {query}\n\nThe blog{source} editors compared the most popular options.\n\n{sections}\n"
+
+
+def classify_prompt(messages: List[BaseMessage]) -> str:
+    """Which workflow prompt a message list is: category, extraction, fallback, analysis, batch_analysis or recommendations"""
+    system = messages[0].content if messages else ""
+    user = messages[-1].content if messages else ""
+    if system == DeveloperToolsPrompts.TOOL_EXTRACTION_SYSTEM:
+        return "extraction"
+    if system == DeveloperToolsPrompts.TOOL_ANALYSIS_SYSTEM:
+        return "batch_analysis" if '"analyses"' in user else "analysis"
+    if system == DeveloperToolsPrompts.RECOMMENDATIONS_SYSTEM:
+        return "recommendations"
+    if "categorizes" in system:
+        return "category"
+    return "fallback"
+
+
+def prompt_key(messages: List[BaseMessage]) -> str:
+    """Replay key for a prompt: its kind plus a hash of every message, e.g. "analysis:3f2a..." """
+    text = "\n".join(f"{message.type}:{message.content}" for message in messages)
+    return f"{classify_prompt(messages)}:{hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]}"
+
+
+class Fixtures:
+    """Recorded Firecrawl and LLM responses plus optional LLM overrides, stored as one JSON file
+
+    Layout: {"search": {normalized query: [hit, ...]}, "scrape": {normalized url: markdown},
+    "responses": {prompt_key: text},
+    "llm": {"category" | "extraction" | "fallback" | "recommendations": text,
+            "analysis": {...}, "batch_analysis": {"analyses": [...]}}}
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        data = data or {}
+        self.search: Dict[str, List[Dict[str, Any]]] = data.get("search", {})
+        self.scrape: Dict[str, str] = data.get("scrape", {})
+        self.responses: Dict[str, str] = data.get("responses", {})
+        self.llm: Dict[str, Any] = data.get("llm", {})
+        self._lock = threading.Lock()
+
+
+    @classmethod
+    def load(cls, path: Optional[str]) -> "Fixtures":
+        if not path:
+            return cls()
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+
+    def save(self, path: str):
+        with self._lock, open(path, "w", encoding="utf-8") as f:
+            json.dump({"search": self.search, "scrape": self.scrape, "responses": self.responses, "llm": self.llm}, f, indent=2)
+
+
+class Latency:
+    """Injected per-call delay: mean seconds with uniform +/- jitter, reproducible via seed"""
+
+    def __init__(self, mean: float = 0.0, jitter: float = 0.25, seed: int = 0):
+        self.mean = mean
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+
+    def sleep(self):
+        if self.mean <= 0:
+            return
+        with self._lock:
+            factor = self._rng.uniform(1 - self.jitter, 1 + self.jitter)
+        time.sleep(self.mean * factor)
+
+
+class FakeFirecrawlApp:
+    """Stands in for FirecrawlApp: replays fixtures, otherwise synthesizes plausible pages"""
+
+    def __init__(self, fixtures: Optional[Fixtures] = None, search_latency: Optional[Latency] = None,
+                 scrape_latency: Optional[Latency] = None, embedded_chars: Optional[int] = None):
+        self.fixtures = fixtures or Fixtures()
+        self.embedded_chars = embedded_chars
+        self.search_latency = search_latency or Latency()
+        self.scrape_latency = scrape_latency or Latency()
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+
+    def search(self, query: str, limit: int = 5, **kwargs) -> SearchResponse:
+        self._count("search")
+        self.search_latency.sleep()
+
+        recorded = self.fixtures.search.get(normalize_query(query))
+        if recorded is not None:
+            return SearchResponse(success=True, data=recorded[:limit])
+
+        if "comparison" in query:
+            data = [
+                {
+                    "url": f"https://blog{i}.example.com/{_slug(query)}",
+                    "markdown": _article(query, i),
+                    "metadata": {"title": f"Top tools ({i})"},
+                }
+                for i in range(limit)
+            ]
+        else:
+            name = next((tool for tool in TOOL_POOL if tool.lower() in query.lower()), query.split()[0])
+            data = [
+                {
+                    "url": f"https://{_slug(name)}.example.com/{'pricing' if i == 0 else f'docs/{i}'}",
+                    "markdown": _tool_page(name),
+                    "metadata": {"title": name},
+                }
+                for i in range(limit)
+            ]
+        if self.embedded_chars is not None:
+            # Simulate search payloads whose page markdown is cut short or missing
+            data = [{**hit, "markdown": hit["markdown"][:self.embedded_chars]} for hit in data]
+        return SearchResponse(success=True, data=data)
+
+
+    def scrape_url(self, url: str, **kwargs) -> ScrapeResponse:
+        self._count("scrape")
+        self.scrape_latency.sleep()
+
+        recorded = self.fixtures.scrape.get(normalize_url(url))
+        if recorded is not None:
+            return ScrapeResponse(markdown=recorded)
+
+        host = url.split("//", 1)[-1].split("/", 1)[0]
+        if host.startswith("blog"):
+            return ScrapeResponse(markdown=_article(url.rsplit("/", 1)[-1].replace("-", " "), int(host[4:].split(".")[0] or 0)))
+        name = next((tool for tool in TOOL_POOL if _slug(tool) == host.split(".")[0]), host.split(".")[0].title())
+        return ScrapeResponse(markdown=_tool_page(name))
+
+
+    def _count(self, kind: str):
+        with self._lock:
+            self.calls[kind] += 1
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model that recognizes each workflow prompt and answers offline
+
+    Recorded responses (matched by prompt_key) win over per-kind overrides, which win over
+    the synthetic answers.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.25
+    overrides: Dict[str, Any] = {}
+    recorded: Dict[str, str] = {}
+    _latency: Latency = PrivateAttr()
+    _calls: Counter = PrivateAttr(default_factory=Counter)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+
+    def model_post_init(self, __context):
+        self._latency = Latency(self.latency, self.jitter)
+
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+
+    @property
+    def calls(self) -> Counter:
+        return self._calls
+
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        text = self._respond(messages)
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            piece = word if i == len(words) - 1 else word + " "
+            usage = self._usage(messages, text) if i == len(words) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+
+    def with_structured_output(self, schema, **kwargs):
+        def parse(messages, **kwargs):
+            return schema(**json.loads(self.invoke(messages, **kwargs).content))
+        return RunnableLambda(parse)
+
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        user = messages[-1].content if messages else ""
+        kind = classify_prompt(messages)
+        with self._lock:
+            self._calls[kind] += 1
+        self._latency.sleep()
+
+        recorded = self.recorded.get(prompt_key(messages)) if self.recorded else None
+        if recorded is not None:
+            return recorded
+        if kind in self.overrides:
+            override = self.overrides[kind]
+            return override if isinstance(override, str) else json.dumps(override)
+
+        if kind == "category":
+            query = user.split('"')[1] if '"' in user else user
+            examples = ", ".join(_pick_tools(query, 5))
+            return f"CATEGORY: developer tools\nEXAMPLES: {examples}\nEXCLUDE: tool, platform, service"
+        if kind == "extraction":
+            mentioned = [tool for tool in TOOL_POOL if tool in user]
+            return "\n".join(mentioned[:5]) or "No specific tools found"
+        if kind == "fallback":
+            query = user.split('"')[1] if '"' in user else user
+            return "\n".join(_pick_tools(query, 4))
+        if kind == "analysis":
+            return json.dumps(self._analysis())
+        if kind == "batch_analysis":
+            names = re.findall(r"^=== Company/Tool: (.+?) ===$", user, re.MULTILINE)
+            return json.dumps({"analyses": [{"name": name, **self._analysis()} for name in names]})
+        return "Pick the first tool for its free tier and mature SDKs. The others are solid alternatives."
+
+
+    @staticmethod
+    def _analysis() -> Dict[str, Any]:
+        return {
+            "pricing_model": "Free",
+            "is_open_source": True,
+            "tech_stack": ["Python", "JavaScript"],
+            "description": "A developer platform for building and shipping applications.",
+            "api_available": True,
+            "language_support": ["Python", "JavaScript", "Go"],
+            "integration_capabilities": ["GitHub", "Docker"],
+        }
+
+
+    @staticmethod
+    def _usage(messages: List[BaseMessage], text: str) -> Dict[str, int]:
+        input_tokens = sum(len(str(message.content)) for message in messages) // 4
+        output_tokens = len(text) // 4
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
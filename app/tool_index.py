@@ -0,0 +1,226 @@
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from .cache import ContentCache, make_key
+
+
+PREFIX = "tool:"
+PARENTHETICAL = re.compile(r"\s*[(\[][^)\]]*[)\]]")
+NON_KEY = re.compile(r"[^a-z0-9+#]")
+# Shorter keys are too easy to confuse by one edit ("MySQL"/"MSSQL", "Bun"/"Run"), so they only match exactly
+MIN_FUZZY_CHARS = 6
+
+# Well-known spellings that fuzzy matching must not guess at; everything else is learned from runs
+SEED_ALIASES: Dict[str, List[str]] = {
+    "PostgreSQL": ["Postgres", "psql"],
+    "MongoDB": ["Mongo"],
+    "Kubernetes": ["k8s"],
+    "Google Cloud": ["GCP", "Google Cloud Platform"],
+    "AWS": ["Amazon Web Services"],
+    "Microsoft Azure": ["Azure"],
+    "Visual Studio Code": ["VS Code", "VSCode"],
+    "Next.js": ["NextJS"],
+    "Node.js": ["Node", "NodeJS"],
+    "Vue": ["Vue.js", "VueJS"],
+    "React": ["ReactJS", "React.js"],
+    "GitHub Copilot": ["Copilot"],
+    "Amazon DynamoDB": ["DynamoDB"],
+}
+
+
+def tool_key(name: str) -> str:
+    """Comparison key for a tool name: "Postgres (Neon)" -> "postgres", "Next.js" -> "nextjs" """
+    return NON_KEY.sub("", PARENTHETICAL.sub("", name).lower())
+
+
+def name_tokens(name: str) -> int:
+    """Word count of a tool name, ignoring parentheticals: "Google Cloud Run" -> 3"""
+    return sum(1 for word in PARENTHETICAL.sub("", name).lower().split() if NON_KEY.sub("", word))
+
+
+def trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+@dataclass
+class ToolEntry:
+    name: str
+    aliases: List[str] = field(default_factory=list)
+    url: str = ""
+    domain: str = ""
+    category: str = ""
+    seen: int = 0
+    updated_at: float = 0.0
+
+
+class _TrigramIndex:
+    """Maps tool names to a value by exact key, with a strict fuzzy fallback for spelling slips
+
+    match() only accepts a different key with the same word count, at least MIN_FUZZY_CHARS
+    characters, within max_distance edits and not merely extended at the end, so related
+    products ("Google Cloud Run" and "Google Cloud", "PostgREST" and "Postgres") stay apart. Trigram postings narrow down the
+    candidates before the edit distance is computed.
+    """
+
+    def __init__(self, max_distance: int = 1):
+        self.max_distance = max_distance
+        self.values: Dict[str, str] = {}
+        self.tokens: Dict[str, int] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+
+
+    def add(self, name: str, value: str):
+        key = tool_key(name)
+        if not key:
+            return
+        self.values[key] = value
+        self.tokens[key] = name_tokens(name)
+        for gram in trigrams(key):
+            self.postings[gram].add(key)
+
+
+    def get(self, name: str) -> Optional[str]:
+        return self.values.get(tool_key(name))
+
+
+    def match(self, name: str) -> Tuple[Optional[str], bool]:
+        """(value, fuzzy) for the exact key, else for the closest key that passes the near-miss guard"""
+        key = tool_key(name)
+        if key in self.values:
+            return self.values[key], False
+        if self.max_distance <= 0 or len(key) < MIN_FUZZY_CHARS:
+            return None, False
+        tokens = name_tokens(name)
+        shared = Counter(candidate for gram in trigrams(key) for candidate in self.postings.get(gram, ()))
+        for candidate, _ in shared.most_common():
+            # A name that only adds letters at the end is usually a sibling product ("PostgREST", "AngularJS")
+            extended = candidate.startswith(key) or key.startswith(candidate)
+            if (self.tokens[candidate] == tokens and len(candidate) >= MIN_FUZZY_CHARS and not extended
+                    and abs(len(candidate) - len(key)) <= self.max_distance
+                    and edit_distance(key, candidate) <= self.max_distance):
+                return self.values[candidate], True
+        return None, False
+
+
+class ToolIndex:
+    """Canonical tool names with aliases, official URL and category, learned from past runs
+
+    Names resolve by exact key or known alias, so "Postgres", "PostgreSQL" and "Postgres (Neon)"
+    all research one tool under one cache key. Other spellings only resolve within
+    max_distance edits of a known name with the same word count ("Kubernates"), and only
+    lookup(), which never guesses, decides whether a stored page can replace the search.
+    """
+
+    def __init__(self, cache: Optional[ContentCache] = None, max_distance: int = 1):
+        self.cache = cache
+        self.entries: Dict[str, ToolEntry] = {}
+        self.counters = Counter()
+        self._index = _TrigramIndex(max_distance)
+        self._lock = threading.Lock()
+
+        for name, aliases in SEED_ALIASES.items():
+            self._add(ToolEntry(name=name, aliases=list(aliases)))
+        for entry in self._load():
+            self._add(entry)
+
+
+    def lookup(self, name: str) -> Optional[ToolEntry]:
+        """The entry whose name or a known alias has exactly this key"""
+        with self._lock:
+            canonical = self._index.get(name)
+            return self.entries[tool_key(canonical)] if canonical else None
+
+
+    def resolve(self, name: str) -> Optional[ToolEntry]:
+        """Like lookup(), but also accepts a near-miss spelling of a known name"""
+        with self._lock:
+            canonical, fuzzy = self._index.match(name)
+            self.counters["lookups"] += 1
+            self.counters["hits" if canonical else "misses"] += 1
+            self.counters["fuzzy_hits"] += fuzzy
+            return self.entries[tool_key(canonical)] if canonical else None
+
+
+    def canonicalize(self, names: Iterable[str]) -> List[str]:
+        """Map names to canonical names and drop those that resolve to a tool already listed"""
+        seen = _TrigramIndex(self._index.max_distance)
+        result = []
+        for name in names:
+            entry = self.resolve(name)
+            canonical = entry.name if entry else name
+            if seen.match(canonical)[0]:
+                self.counters["merged"] += 1
+                continue
+            seen.add(canonical, canonical)
+            seen.add(name, canonical)
+            result.append(canonical)
+        return result
+
+
+    def record(self, name: str, url: str = "", category: str = ""):
+        """Remember a researched tool's official page so later runs can skip its search
+
+        Only an exact name or alias updates an existing entry; anything else gets its own, so a
+        near-miss never rewrites another tool's URL.
+        """
+        with self._lock:
+            canonical = self._index.get(name)
+            entry = self.entries[tool_key(canonical)] if canonical else ToolEntry(name=name)
+            if name != entry.name and name not in entry.aliases:
+                entry.aliases.append(name)
+            if url:
+                entry.url = url
+                entry.domain = urlsplit(url).netloc.lower().removeprefix("www.")
+            entry.category = category or entry.category
+            entry.seen += 1
+            entry.updated_at = time.time()
+            self._add(entry)
+            self.counters["recorded"] += 1
+        if self.cache:
+            self.cache.set(make_key("tool", tool_key(entry.name)), asdict(entry), tag=PREFIX + tool_key(entry.name))
+
+
+    def count(self, key: str):
+        with self._lock:
+            self.counters[key] += 1
+
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tools": len(self.entries),
+                "with_url": sum(1 for entry in self.entries.values() if entry.url),
+                **{key: self.counters[key] for key in ("lookups", "hits", "fuzzy_hits", "misses", "merged", "recorded", "search_skipped")},
+            }
+
+
+    def _add(self, entry: ToolEntry):
+        self.entries[tool_key(entry.name)] = entry
+        for name in [entry.name, *entry.aliases]:
+            self._index.add(name, entry.name)
+
+
+    def _load(self) -> List[ToolEntry]:
+        if not self.cache:
+            return []
+        entries = []
+        for _, key in self.cache.tagged(PREFIX):
+            data = self.cache.get(key)
+            if data:
+                entries.append(ToolEntry(**data))
+        return entries
@@ -0,0 +1,38 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class Warmup(Generic[T]):
+    """Runs an expensive factory on a daemon thread; get() blocks until the result is ready"""
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._result: Optional[T] = None
+        self._error: Optional[BaseException] = None
+        self._done = threading.Event()
+        # Daemon, so quitting before warm-up finishes does not wait for it
+        threading.Thread(target=self._run, name="warmup", daemon=True).start()
+
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+
+    def get(self) -> T:
+        self._done.wait()
+        if self._error:
+            raise self._error
+        return self._result
+
+
+    def _run(self):
+        try:
+            self._result = self._factory()
+        except BaseException as e:
+            self._error = e
+        finally:
+            self._done.set()
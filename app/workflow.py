@@ -1,36 +1,199 @@
+import contextvars
 import re
-from typing import Dict, List, Any
-from langgraph.graph import StateGraph, END
-from langchain_anthropic import ChatAnthropic
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Tuple, TypeVar
+from langgraph.config import get_config, get_stream_writer
+from langgraph.graph import StateGraph, START, END
 from langchain_core.messages import HumanMessage, SystemMessage
-from .models import ResearchState, CompanyInfo, CompanyAnalysis
+from langchain_anthropic import ChatAnthropic
+from .models import ResearchState, CompanyInfo, CompanyAnalysis, BatchCompanyAnalysis
 from .firecrawl import FirecrawlService
 from .prompts import DeveloperToolsPrompts
 from .logger import ProgressLogger
+from .config import Settings
+from .cache import ContentCache
+from .analysis_store import AnalysisStore
+from .query_cache import QueryCache
+from .checkpoint import RunProgress, SqliteCheckpointer, run_id_for
+from .blobs import BlobStore, excerpt
+from .dedup import MinHashDeduper
+from .tool_index import ToolIndex
+from .speculation import Speculation
+from .deadline import Deadline
+from .profiling import Profiler
+from .callbacks import LLMProfilingHandler
+from .http_pool import HttpPool
+from .scheduler import ProviderPolicy, Scheduler
+from .extractor import RuleExtractor, RuleResult
+from .packer import ANALYSIS_KEYWORDS, EXTRACTION_KEYWORDS, ContentPacker, estimate_tokens, truncate_to_tokens
+
+
+RECOMMENDATIONS_FAILED = "Unable to generate recommendations in given time"
+FALLBACK_EXAMPLES = ["Alternative1", "Alternative2", "Alternative3"]
+
+T = TypeVar("T")
 
 
 class Workflow:
-    def __init__(self):
-        self.firecrawl = FirecrawlService()
-        self.llm = ChatAnthropic(model="claude-3-5-haiku-latest", temperature=0.1)
+    def __init__(
+        self,
+        settings: Optional[Settings] = None,
+        logger: Optional[ProgressLogger] = None,
+        profiler: Optional[Profiler] = None,
+        firecrawl_app=None,
+        llm=None
+    ):
+        self.settings = settings or Settings.from_env()
+        self.profiler = profiler or Profiler(enabled=False)
+        self.scheduler = Scheduler({
+            "firecrawl": ProviderPolicy(
+                rate=self.settings.firecrawl_rate,
+                burst=self.settings.firecrawl_burst,
+                failure_threshold=self.settings.circuit_failure_threshold,
+                reset_timeout=self.settings.circuit_reset_timeout
+            ),
+            "anthropic": ProviderPolicy(
+                rate=self.settings.anthropic_rate,
+                burst=self.settings.anthropic_burst,
+                max_retries=self.settings.llm_max_retries,
+                failure_threshold=self.settings.circuit_failure_threshold,
+                reset_timeout=self.settings.circuit_reset_timeout
+            ),
+        })
+        # One keep-alive pool per process, shared by every Workflow built in it
+        self.http = HttpPool.shared(self.settings)
+        self.firecrawl = FirecrawlService(
+            cache=self._build_cache("firecrawl.db"),
+            profiler=self.profiler,
+            app=firecrawl_app,
+            scheduler=self.scheduler,
+            min_embedded_chars=self.settings.min_embedded_chars,
+            timeout=self.settings.firecrawl_timeout or None,
+            session=self.http.session
+        )
+        analysis_cache = self._build_cache("analysis.db", ttl=self.settings.analysis_ttl)
+        self.analysis_store = AnalysisStore(analysis_cache) if analysis_cache else None
+        query_cache = self._build_cache("queries.db", ttl=self.settings.query_cache_ttl) if self.settings.query_cache_ttl > 0 else None
+        self.query_cache = QueryCache(query_cache, self.settings.query_cache_threshold) if query_cache else None
+        # Scraped pages live in the blob store; state only carries their digests and excerpts
+        self.blobs = BlobStore(
+            self.settings.blob_dir or os.path.join(self.settings.cache_dir, "blobs"), ttl=self.settings.blob_ttl
+        )
+        # langchain-anthropic keeps one keep-alive httpx client per base URL and timeout, so
+        # every Workflow in the process already shares its Anthropic connections
+        self.llm = llm or ChatAnthropic(
+            model="claude-3-5-haiku-latest",
+            temperature=0.1,
+            max_retries=0,
+            timeout=self.settings.llm_timeout or None,
+            callbacks=[LLMProfilingHandler(self.profiler)]
+        )
+        if self.settings.http_warmup and firecrawl_app is None:
+            self.http.warm_up(self.firecrawl.app.api_url)
         self.prompts = DeveloperToolsPrompts()
+        self.rule_extractor = RuleExtractor(self.settings.rule_confidence) if self.settings.rule_extraction else None
+        self.analysis_packer = ContentPacker(ANALYSIS_KEYWORDS)
+        self.extraction_packer = ContentPacker(EXTRACTION_KEYWORDS, headings_first=True)
+        self.deduper = MinHashDeduper(self.settings.dedup_threshold) if self.settings.dedup_enabled else None
+        self.tool_index = ToolIndex(
+            self._build_cache("tools.db", ttl=self.settings.tool_index_ttl), self.settings.tool_match_distance
+        ) if self.settings.tool_index_enabled else None
+        self.speculation = Speculation(
+            self._research_tool, self.settings.research_concurrency
+        ) if self.settings.speculative_research else None
+        self.checkpointer = SqliteCheckpointer(
+            os.path.join(self.settings.cache_dir, "checkpoints.db")
+        ) if self.settings.checkpoint_enabled else None
+        self.progress = RunProgress(
+            os.path.join(self.settings.cache_dir, "progress.db"), self.checkpointer, ttl=self.settings.checkpoint_ttl
+        ) if self.checkpointer else None
+        # Calls made under a deadline run here, so a stage can stop waiting for them
+        self._timed_calls = ThreadPoolExecutor(max_workers=max(8, 2 * self.settings.research_concurrency), thread_name_prefix="timed")
+        self._active_runs = set()
+        self._runs_lock = threading.Lock()
         self.workflow = self._build_workflow()
-        self.logger = ProgressLogger()
+        self.logger = logger or ProgressLogger()
+
+
+    def _invoke_llm(self, messages, model=None, deadline: Optional[Deadline] = None):
+        model = model or self.llm
+
+        def invoke():
+            # The request itself ends with the deadline, so an abandoned call frees its timed worker
+            # instead of holding it for the whole LLM_TIMEOUT
+            return model.invoke(messages, **self._request_timeout(deadline))
+        return self._within(deadline, lambda: self.scheduler.call(
+            "anthropic", invoke, deadline=deadline.at if deadline else None
+        ))
+
+
+    def _within(self, deadline: Optional[Deadline], fn: Callable[[], T]) -> T:
+        """Run fn, giving up with TimeoutError when the deadline passes first"""
+        timeout = deadline.remaining() if deadline else None
+        if timeout is None:
+            return fn()
+        if deadline.expired():
+            # Don't start a paid call that would only be abandoned
+            raise TimeoutError("ran past its share of the query deadline")
+        future = self._submit(self._timed_calls, fn)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError:
+            # The call itself is abandoned, not interrupted; callers pass the remaining time down as its
+            # provider timeout, so it ends shortly after
+            future.cancel()
+            raise TimeoutError("ran past its share of the query deadline") from None
+
+
+    @staticmethod
+    def _submit(executor: ThreadPoolExecutor, fn: Callable[..., T], *args):
+        # Run in a copy of the caller's context, so LangGraph's config, callbacks and stream writer still resolve
+        return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+    @staticmethod
+    def _request_timeout(deadline: Optional[Deadline]) -> Dict[str, float]:
+        if not deadline or deadline.at is None:
+            return {}
+        return {"timeout": max(1.0, deadline.remaining())}
+
+
+    def _deadline(self) -> Deadline:
+        return Deadline(get_config().get("configurable", {}).get("deadline_at"))
+
+
+    def _build_cache(self, filename: str, ttl: Optional[float] = None) -> Optional[ContentCache]:
+        if not self.settings.cache_enabled:
+            return None
+        return ContentCache(
+            os.path.join(self.settings.cache_dir, filename),
+            ttl=ttl or self.settings.cache_ttl,
+            max_bytes=self.settings.cache_max_mb * 1024 * 1024
+        )
 
 
     def _build_workflow(self):
         graph = StateGraph(ResearchState)
-        graph.add_node("extract_tools", self._extract_tools_step)
-        graph.add_node("research", self._research_step)
-        graph.add_node("analyze", self._analyze_step)
-        graph.set_entry_point("extract_tools")
+        graph.add_node("detect_category", self.profiler.wrap("detect_category", "node", self._detect_category_step))
+        graph.add_node("gather_articles", self.profiler.wrap("gather_articles", "node", self._gather_articles_step))
+        graph.add_node("extract_tools", self.profiler.wrap("extract_tools", "node", self._extract_tools_step))
+        graph.add_node("research", self.profiler.wrap("research", "node", self._research_step))
+        graph.add_node("analyze", self.profiler.wrap("analyze", "node", self._analyze_step))
+        # Category detection only feeds the extraction prompt, so it runs alongside the article search
+        graph.add_edge(START, "detect_category")
+        graph.add_edge(START, "gather_articles")
+        graph.add_edge(["detect_category", "gather_articles"], "extract_tools")
         graph.add_edge("extract_tools", "research")
         graph.add_edge("research", "analyze")
         graph.add_edge("analyze", END)
-        return graph.compile()
+        return graph.compile(checkpointer=self.checkpointer)
 
 
-    def _get_dynamic_category_info(self, query: str) -> Dict[str, Any]:
+    def _get_dynamic_category_info(self, query: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         category_prompt = f"""
         Analyze this developer tools query: "{query}"
         
@@ -51,10 +214,10 @@ class Workflow:
         """
         
         try:
-            response = self.llm.invoke([
+            response = self._invoke_llm([
                 SystemMessage(content="You are a tech expert who categorizes developer tools and suggests alternatives."),
                 HumanMessage(content=category_prompt)
-            ])
+            ], deadline=deadline)
             
             lines = response.content.strip().split("\n")
             category = ""
@@ -81,12 +244,12 @@ class Workflow:
             self.logger.log_error("Failed to get dynamic category info", e)
             return {
                 "category": "developer tools and services",
-                "examples": ["Alternative1", "Alternative2", "Alternative3"],
+                "examples": FALLBACK_EXAMPLES,
                 "exclude_terms": ["tool", "service", "platform"]
             }
 
 
-    def _generate_fallback_tools(self, query: str) -> List[str]:
+    def _generate_fallback_tools(self, query: str, deadline: Optional[Deadline] = None) -> List[str]:
         fallback_prompt = f"""
         The user asked: "{query}"
         
@@ -109,10 +272,10 @@ class Workflow:
         try:
             self.logger.start_spinner("Generating intelligent fallback suggestions...")
         
-            response = self.llm.invoke([
+            response = self._invoke_llm([
                 SystemMessage(content="You are a knowledgeable developer who knows popular tools in every domain."),
                 HumanMessage(content=fallback_prompt)
-            ])
+            ], deadline=deadline)
             
             tools = []
             for line in response.content.strip().split("\n"):
@@ -132,44 +295,84 @@ class Workflow:
             return ["Generic Alternative"]
 
 
-    def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
-        self.logger.log_step("🌐", f"Finding articles about: {state.query}")
-
-        category_info = self._get_dynamic_category_info(state.query)
+    def _detect_category_step(self, state: ResearchState) -> Dict[str, Any]:
+        # Category detection runs alongside gather_articles and shares its slice of the deadline
+        deadline = self._deadline().stage("gather_articles")
+        category_info = self._get_dynamic_category_info(state.query, deadline)
         self.logger.log_substep(f"Detected category: {category_info['category']}")
+        if self.speculation:
+            self._speculate(category_info)
+        if deadline.expired():
+            return {"category_info": category_info, "partial": ["category_info"]}
+        return {"category_info": category_info}
+
+
+    def _example_tools(self, category_info: Dict[str, Any]) -> List[str]:
+        examples = category_info.get("examples") or []
+        if examples == FALLBACK_EXAMPLES:
+            return []
+        tools = [example.strip("[] ") for example in examples if example.strip("[] ")]
+        return self.tool_index.canonicalize(tools) if self.tool_index else tools
+
+
+    def _speculate(self, category_info: Dict[str, Any]):
+        # The category examples are usually the tools extraction will name, so start on them now
+        guesses = self._example_tools(category_info)[:self.settings.speculative_tools]
+        if guesses:
+            self.logger.log_substep(f"Speculatively researching {', '.join(guesses)}")
+            # Guesses get the whole query's deadline, not this stage's slice, since research uses them
+            self.speculation.start(self._run_key(get_config()), guesses, self._deadline())
+
+
+    @staticmethod
+    def _run_key(config: Dict[str, Any]) -> str:
+        return config["configurable"]["run_key"]
+
+
+    def _gather_articles_step(self, state: ResearchState) -> Dict[str, Any]:
+        self.logger.log_step("🌐", f"Finding articles about: {state.query}")
         
-        self.logger.start_spinner("Searching for relevant articles...")
+        deadline = self._deadline().stage("gather_articles")
+        self.logger.start_spinner("Searching for relevant articles...", task="articles")
         try:
             article_query = f"{state.query} tools comparison best alternatives"
-            search_results = self.firecrawl.search_companies(article_query, num_results=3)
-            self.logger.stop_spinner(f"Found {len(search_results.data)} articles")
+            search_results = self._within(deadline, lambda: self.firecrawl.search_companies(
+                article_query, num_results=3, timeout=deadline.remaining()
+            ))
+            self.logger.stop_spinner(f"Found {len(search_results.data)} articles", task="articles")
         except Exception as e:
-            self.logger.stop_spinner("")
+            self.logger.stop_spinner("", task="articles")
             self.logger.log_error("Failed to search articles", e)
-            return {"extracted_tools": []}
+            return {"articles": [], "partial": ["articles"]} if deadline.expired() else {"articles": []}
             
-        self.logger.start_spinner("Scraping article content...")
-        all_content = ""
-        scraped_count = 0
+        self.logger.start_spinner("Scraping article content...", task="articles")
+        articles = [self.blobs.put(article) for article in self._scrape_articles(search_results.data, deadline)]
         
-        for i, result in enumerate(search_results.data):
-            url = result.get("url", "")
-            scraped = self.firecrawl.scrape_company_page(url)
-            if scraped:
-                all_content += scraped.markdown[:1500] + "\n\n"
-                scraped_count += 1
-            
-            self.logger.stop_spinner(f"Scraped {scraped_count} articles ({len(all_content)} characters)")
-            
-            self.logger.start_spinner("Analyzing content to extract tool names...")
+        dropped = len(search_results.data) - len(articles)
+        summary = f"Scraped {len(articles)} articles ({sum(article.size for article in articles)} characters)"
+        self.logger.stop_spinner(summary + (f", skipped {dropped}" if dropped else ""), task="articles")
+        if dropped and deadline.expired():
+            return {"articles": articles, "partial": ["articles"]}
+        return {"articles": articles}
 
-            messages = [
+
+    def _extract_tools_step(self, state: ResearchState) -> Dict[str, Any]:
+        category_info = state.category_info
+        deadline = self._deadline().stage("extract_tools")
+        all_content = self.extraction_packer.pack_many(
+            self._distinct_articles([self.blobs.get(article) or article.excerpt for article in state.articles]),
+            self.settings.extraction_token_budget,
+            query=state.query
+        )
+        
+        self.logger.start_spinner("Analyzing content to extract tool names...")
+        messages = [
             SystemMessage(content=self.prompts.TOOL_EXTRACTION_SYSTEM),
             HumanMessage(content=self.prompts.tool_extraction_user(state.query, all_content, category_info))
         ]
         
         try:
-            response = self.llm.invoke(messages)
+            response = self._invoke_llm(messages, deadline=deadline)
             self.logger.stop_spinner("Content analysis complete")
             
             extracted_text = response.content.strip()
@@ -196,13 +399,17 @@ class Workflow:
                     
                     tools.append(line)
                 
-            seen = set()
-            tools = [tool for tool in tools if not (tool.lower() in seen or seen.add(tool.lower()))]
+            if self.tool_index:
+                # Spelling variants ("Postgres", "PostgreSQL") collapse onto one canonical name
+                tools = self.tool_index.canonicalize(tools)
+            else:
+                seen = set()
+                tools = [tool for tool in tools if not (tool.lower() in seen or seen.add(tool.lower()))]
             tools = tools[:5]
             
             if not tools:
                 self.logger.log_warning("No specific tools found in articles, using fallback search")
-                fallback_tools = self._generate_fallback_tools(state.query)
+                fallback_tools = self._generate_fallback_tools(state.query, deadline)
                 return {"extracted_tools": fallback_tools}
             
             self.logger.log_step("⛏️", f"Extracted tools: {', '.join(tools)}")
@@ -211,21 +418,98 @@ class Workflow:
         except Exception as e:
             self.logger.stop_spinner("")
             self.logger.log_error("Failed to extract tools", e)
-            fallback_tools = self._generate_fallback_tools(state.query)
+            if deadline.expired():
+                # No time for another LLM call; the category examples are the best guess at hand
+                return {"extracted_tools": self._example_tools(category_info)[:5], "partial": ["extracted_tools"]}
+            fallback_tools = self._generate_fallback_tools(state.query, deadline)
             return {"extracted_tools": fallback_tools}
 
 
-    def _analyze_company_content(self, company_name: str, content: str) -> CompanyAnalysis:
+    def _distinct_articles(self, articles: List[str]) -> List[str]:
+        """Drop syndicated copies and repeated paragraphs so the extraction budget goes to distinct text"""
+        if not self.deduper:
+            return articles
+        with self.profiler.span("dedup", "dedup", bytes_saved=0, tokens_saved=0) as span:
+            result = self.deduper.dedupe(articles)
+            span["bytes_saved"] = result.bytes_saved
+            span["tokens_saved"] = result.tokens_saved
+        
+        if result.articles_dropped or result.paragraphs_dropped:
+            self.logger.log_substep(
+                f"Removed {result.articles_dropped} duplicate articles and {result.paragraphs_dropped} repeated paragraphs "
+                f"({result.bytes_saved} bytes, ~{result.tokens_saved} tokens)"
+            )
+        return result.documents
+
+
+    def _scrape_articles(self, hits: List[Dict[str, Any]], deadline: Optional[Deadline] = None) -> List[str]:
+        hits = [hit for hit in hits if hit.get("url")]
+        if not hits:
+            return []
+        
+        timeout = self.settings.article_scrape_timeout
+        if deadline and deadline.remaining() is not None:
+            timeout = min(timeout, deadline.remaining())
+        executor = ThreadPoolExecutor(max_workers=len(hits))
+        futures = [
+            executor.submit(self.firecrawl.resolve_content, hit, timeout=timeout)
+            for hit in hits
+        ]
+        done, _ = wait(futures, timeout=timeout)
+        # Pages still loading past the deadline are abandoned rather than awaited
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        articles = []
+        for future in futures:
+            if future not in done or future.exception():
+                continue
+            markdown = future.result()
+            if markdown:
+                articles.append(markdown)
+        return articles
+
+
+    def _stored_analysis(self, company_name: str, content: str) -> Optional[CompanyAnalysis]:
+        if not self.analysis_store:
+            return None
+        with self.profiler.span("analysis_store.get", "cache", cache_hit=False) as span:
+            stored = self.analysis_store.get(company_name, content)
+            span["cache_hit"] = stored is not None
+        return stored
+
+
+    def _extract_rules(self, company_name: str, content: str) -> RuleResult:
+        if not self.rule_extractor:
+            return RuleResult()
+        with self.profiler.span("rules.extract", "rules", llm_skipped=False) as span:
+            rules = self.rule_extractor.extract(content, company_name)
+            span["llm_skipped"] = rules.complete
+            span["fields"] = len(rules.confident())
+        return rules
+
+
+    def _analyze_company_content(self, company_name: str, content: str, deadline: Optional[Deadline] = None) -> CompanyAnalysis:
+        stored = self._stored_analysis(company_name, content)
+        if stored:
+            return stored
+        
+        rules = self._extract_rules(company_name, content)
+        if rules.complete:
+            return rules.analysis()
+        return self._llm_analysis(company_name, content, rules, deadline)
+
+
+    def _llm_analysis(self, company_name: str, content: str, rules: RuleResult,
+                      deadline: Optional[Deadline] = None) -> CompanyAnalysis:
         structured_llm = self.llm.with_structured_output(CompanyAnalysis)
         
         messages = [
             SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
-            HumanMessage(content=self.prompts.tool_analysis_user(company_name, content))
+            HumanMessage(content=self.prompts.tool_analysis_user(company_name, self._pack_page(content)))
         ]
 
         try:
-            analysis = structured_llm.invoke(messages)
-            return analysis
+            analysis = rules.fill(self._invoke_llm(messages, structured_llm, deadline))
         except Exception as e:
             print(f"Error: {e}")
             return CompanyAnalysis(
@@ -237,104 +521,616 @@ class Workflow:
                 language_support=[],
                 integration_capabilities=[],
             )
+        
+        if self.analysis_store:
+            self.analysis_store.put(company_name, content, analysis)
+        return analysis
+
+
+    def _analyze_companies_batch(self, items: List[Tuple[str, str, RuleResult]], deadline: Optional[Deadline] = None) -> Dict[str, CompanyAnalysis]:
+        """Analyze several tools in one structured call; tools missing from the result are left to the caller"""
+        if len(items) < 2:
+            return {}
+        
+        user_prompt = self.prompts.tool_batch_analysis_user(
+            [(name, self._pack_page(content)) for name, content, _ in items]
+        )
+        if estimate_tokens(self.prompts.TOOL_ANALYSIS_SYSTEM + user_prompt) > self.settings.batch_token_budget:
+            self.logger.log_substep("Batch analysis exceeds token budget, analyzing tools individually")
+            return {}
+        
+        structured_llm = self.llm.with_structured_output(BatchCompanyAnalysis)
+        messages = [
+            SystemMessage(content=self.prompts.TOOL_ANALYSIS_SYSTEM),
+            HumanMessage(content=user_prompt)
+        ]
+        
+        try:
+            batch = self._invoke_llm(messages, structured_llm, deadline)
+        except Exception as e:
+            self.logger.log_warning(f"Batch analysis failed, analyzing tools individually: {e}")
+            return {}
+        
+        contents = {item[0].lower(): item for item in items}
+        analyses = {}
+        for named in batch.analyses:
+            match = contents.get(named.name.strip().lower())
+            if not match:
+                continue
+            name, content, rules = match
+            analysis = rules.fill(CompanyAnalysis(**named.model_dump(exclude={"name"})))
+            analyses[name] = analysis
+            if self.analysis_store:
+                self.analysis_store.put(name, content, analysis)
+        return analyses
 
 
     def _research_step(self, state: ResearchState) -> Dict[str, Any]:
         extracted_tools = getattr(state, "extracted_tools", [])
+        deadline = self._deadline().stage("research")
         
         if not extracted_tools:
             self.logger.log_warning("No extracted tools found, using direct search")
-            search_results = self.firecrawl.search_companies(state.query, num_results=4)
-            if hasattr(search_results, "data") and search_results.data:
+            try:
+                search_results = self._within(deadline, lambda: self.firecrawl.search_companies(
+                    state.query, num_results=4, timeout=deadline.remaining()
+                ))
+            except TimeoutError:
+                search_results = None
+            if deadline.expired():
+                tool_names = []
+            elif hasattr(search_results, "data") and search_results.data:
                 tool_names = [
                     result.get("metadata", {}).get("title", "Unknown")
                     for result in search_results.data
                 ]
             else:
-                tool_names = self._generate_fallback_tools(state.query)
+                tool_names = self._generate_fallback_tools(state.query, deadline)
         else:
             tool_names = extracted_tools[:4]
 
         self.logger.log_step("🔬", f"Researching {len(tool_names)} specific tools...")
         
-        companies = []
-        for i, tool_name in enumerate(tool_names):
-            self.logger.start_spinner(f"Researching {tool_name} ({i+1}/{len(tool_names)})...")
-            
+        writer = get_stream_writer()
+        writer({"event": "tools", "tools": tool_names})
+        
+        run_id = get_config()["configurable"].get("thread_id") if self.checkpointer else None
+        finished = self._finished_tools(run_id, tool_names)
+        if finished:
+            self.logger.log_substep(f"Reusing {len(finished)} tools researched before the interruption")
+            for company in finished.values():
+                writer({"event": "company", "company": company})
+        
+        remaining = [name for name in tool_names if name not in finished]
+        speculated = self.speculation.claim(self._run_key(get_config()), remaining) if self.speculation else {}
+        if speculated:
+            self.logger.log_substep(f"Reusing speculative research for {', '.join(speculated)}")
+        
+        pending = [name for name in remaining if name not in speculated]
+        self.logger.start_spinner(f"Researching {', '.join(remaining or tool_names)}...")
+        if not pending:
+            results = []
+        elif self.settings.analysis_mode == "batch":
+            results = self._research_tools_batched(pending, writer, run_id, deadline)
+        else:
+            results = self._research_tools_concurrently(pending, writer, run_id, deadline)
+        results += self._collect_speculated(speculated, writer, run_id, deadline)
+        pending += list(speculated)
+        
+        researched = {**finished, **{name: company for name, company in zip(pending, results) if company}}
+        companies = [researched[name] for name in tool_names if name in researched]
+        self._remember_tools(companies, state.category_info.get("category", ""))
+        if deadline.expired():
+            unanalyzed = [company.name for company in companies if company.pricing_model is None]
+            self.logger.stop_spinner(f"Out of time: researched {len(companies) - len(unanalyzed)} of {len(tool_names)} tools"
+                                     + (f", {', '.join(unanalyzed)} unanalyzed" if unanalyzed else ""))
+            return {"companies": companies, "partial": ["companies"]}
+        self.logger.stop_spinner(f"Successfully researched {len(companies)} tools")
+        return {"companies": companies}
+    
+    
+    def _finished_tools(self, run_id: Optional[str], tool_names: List[str]) -> Dict[str, CompanyInfo]:
+        if not run_id:
+            return {}
+        progress = self.progress.load(run_id)
+        return {name: progress[f"tool:{name}"] for name in tool_names if f"tool:{name}" in progress}
+    
+    
+    def _save_tool(self, run_id: Optional[str], tool_name: str, company: Optional[CompanyInfo]):
+        # Failed tools are not recorded, so a resumed run tries them again
+        if run_id and company:
+            self.progress.save(run_id, f"tool:{tool_name}", company)
+    
+    
+    def _remember_tools(self, companies: List[CompanyInfo], category: str):
+        if not self.tool_index:
+            return
+        for company in companies:
+            # Only pages that actually loaded are worth going straight to next time
+            if company.website and company.content:
+                self.tool_index.record(company.name, company.website, category)
+    
+    
+    def _collect_speculated(self, speculated: Dict[str, Any], writer, run_id: Optional[str],
+                            deadline: Optional[Deadline] = None) -> List[Optional[CompanyInfo]]:
+        results = []
+        for name, future in speculated.items():
             try:
-                search_tools = f"{tool_name} official documentation pricing"
-                tool_search_results = self.firecrawl.search_companies(search_tools, num_results=1)
-
-                if hasattr(tool_search_results, "data") and tool_search_results.data:
-                    result = tool_search_results.data[0]
-                    url = result.get("url", "")
-
-                    company = CompanyInfo(
-                        name=tool_name,
-                        description=result.get("markdown", ""),
-                        website=url,
-                        tech_stack=[],
-                        competitors=[]
-                    )
-
-                    scraped = self.firecrawl.scrape_company_page(url)
-                    if scraped and hasattr(scraped, "markdown"):
-                        content = scraped.markdown
-                        analysis = self._analyze_company_content(company.name, content)
-                        
-                        company.pricing_model = analysis.pricing_model
-                        company.is_open_source = analysis.is_open_source
-                        company.tech_stack = analysis.tech_stack
-                        company.description = analysis.description
-                        company.api_available = analysis.api_available 
-                        company.language_support = analysis.language_support
-                        company.integration_capabilities = analysis.integration_capabilities
-                
-                    companies.append(company)
-                    self.logger.stop_spinner(f"{tool_name} research complete")
-                else:
-                    self.logger.stop_spinner("")
-                    self.logger.log_warning(f"No results found for {tool_name}")
-            
+                company = future.result(timeout=deadline.remaining() if deadline else None)
+            except TimeoutError:
+                # A guess still running at the deadline is dropped
+                future.cancel()
+                company = None
             except Exception as e:
-                self.logger.stop_spinner("")
-                self.logger.log_error(f"Failed to research {tool_name}", e)
+                self.logger.log_error(f"Failed to research {name}", e)
+                company = None
+            self._save_tool(run_id, name, company)
+            if company:
+                writer({"event": "company", "company": company})
+            results.append(company)
+        return results
+    
+    
+    def _research_tools_concurrently(self, tool_names: List[str], writer, run_id: Optional[str] = None,
+                                     deadline: Optional[Deadline] = None) -> List[Optional[CompanyInfo]]:
+        workers = max(1, min(self.settings.research_concurrency, len(tool_names)))
+        results = [None] * len(tool_names)
+        fetched: Dict[str, CompanyInfo] = {}
+        out_of_time = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = {
+            self._submit(executor, self._research_tool, name, out_of_time, fetched, deadline): i
+            for i, name in enumerate(tool_names)
+        }
+        try:
+            # The stream writer is bound to this node's context, so emit from here rather than the workers
+            for future in as_completed(futures, timeout=deadline.remaining() if deadline else None):
+                index = futures[future]
+                results[index] = future.result()
+                self._save_tool(run_id, tool_names[index], results[index])
+                if results[index]:
+                    writer({"event": "company", "company": results[index]})
+        except TimeoutError:
+            # Tools still being analyzed keep what their fetch found; tools not fetched yet are dropped
+            out_of_time.set()
+            for future, index in futures.items():
+                if not future.done() and tool_names[index] in fetched:
+                    results[index] = fetched[tool_names[index]]
+                    writer({"event": "company", "company": results[index]})
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        return results
+    
+    
+    def _research_tools_batched(self, tool_names: List[str], writer, run_id: Optional[str] = None,
+                                deadline: Optional[Deadline] = None) -> List[Optional[CompanyInfo]]:
+        workers = max(1, min(self.settings.research_concurrency, len(tool_names)))
+        fetched = self._wait_all(workers, lambda name: self._fetch_tool(name, deadline), tool_names, deadline)
+        
+        pending = []
+        for item in fetched:
+            if not item or not item[1]:
+                continue
+            company, content = item
+            stored = self._stored_analysis(company.name, content)
+            if stored:
+                self._apply_analysis(company, stored)
+                continue
+            rules = self._extract_rules(company.name, content)
+            if rules.complete:
+                self._apply_analysis(company, rules.analysis())
+            else:
+                pending.append((company, content, rules))
+        
+        if len(pending) > 1:
+            self.logger.start_task("batch", f"Analyzing {len(pending)} tools in one request", indent=2)
+        analyses = self._analyze_companies_batch([(company.name, content, rules) for company, content, rules in pending], deadline)
+        self.logger.end_task("batch")
+        leftovers = [item for item in pending if item[0].name not in analyses]
+        if leftovers and not (deadline and deadline.expired()):
+            fallbacks = self._wait_all(
+                workers, lambda item: self._llm_analysis(item[0].name, item[1], item[2], deadline), leftovers, deadline
+            )
+            analyses.update({company.name: analysis for (company, _, _), analysis in zip(leftovers, fallbacks) if analysis})
+        
+        out_of_time = deadline is not None and deadline.expired()
+        results = []
+        for item in fetched:
+            company = item[0] if item else None
+            if company and company.name in analyses:
+                self._apply_analysis(company, analyses[company.name])
+            if company:
+                # Tools cut short by the deadline are not recorded, so a resumed run finishes them
+                if not (out_of_time and company.pricing_model is None):
+                    self._save_tool(run_id, company.name, company)
+                writer({"event": "company", "company": company})
+            results.append(company)
+        return results
+    
+    
+    def _wait_all(self, workers: int, fn: Callable[[Any], T], items: List[Any], deadline: Optional[Deadline] = None) -> List[Optional[T]]:
+        """Map fn over items on a pool; results not ready by the deadline come back as None"""
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [self._submit(executor, fn, item) for item in items]
+        done, _ = wait(futures, timeout=deadline.remaining() if deadline else None)
+        executor.shutdown(wait=False, cancel_futures=True)
+        return [future.result() if future in done else None for future in futures]
+    
+    
+    def _research_tool(self, tool_name: str, cancelled: Optional[threading.Event] = None,
+                       fetched: Optional[Dict[str, CompanyInfo]] = None, deadline: Optional[Deadline] = None) -> Optional[CompanyInfo]:
+        if deadline and deadline.expired():
+            # A tool or guess that only gets a worker after the deadline would be dropped anyway
+            return None
+        result = self._fetch_tool(tool_name, deadline)
+        if not result or (cancelled and cancelled.is_set()):
+            # A cancelled speculative guess or a tool past the deadline keeps its cached page but skips the LLM analysis
+            return None
+        
+        company, content = result
+        if fetched is not None:
+            # What the caller can still use if the deadline passes during analysis
+            fetched[tool_name] = company.model_copy()
+        task = f"tool:{tool_name}"
+        try:
+            if content:
+                self.logger.start_task(task, f"{tool_name}: analyzing", indent=2)
+                self._apply_analysis(company, self._analyze_company_content(company.name, content, deadline))
+            return company
+        
+        except Exception as e:
+            self.logger.log_error(f"Failed to research {tool_name}", e)
+            return None
+        
+        finally:
+            self.logger.end_task(task)
+    
+    
+    def _fetch_tool(self, tool_name: str, deadline: Optional[Deadline] = None) -> Optional[Tuple[CompanyInfo, Optional[str]]]:
+        task = f"tool:{tool_name}"
+        timeout = deadline.remaining() if deadline else None
+        try:
+            known = self._fetch_known_tool(tool_name, deadline)
+            if known:
+                return known
+            
+            self.logger.start_task(task, f"{tool_name}: searching docs", indent=2)
+            search_tools = f"{tool_name} official documentation pricing"
+            tool_search_results = self.firecrawl.search_companies(search_tools, num_results=1, timeout=timeout)
 
-        self.logger.log_substep(f"Successfully researched {len(companies)} tools")        
-        return {"companies": companies}
+            if not (hasattr(tool_search_results, "data") and tool_search_results.data):
+                self.logger.log_warning(f"No results found for {tool_name}")
+                return None
+            
+            result = tool_search_results.data[0]
+            url = result.get("url", "")
+
+            company = CompanyInfo(
+                name=tool_name,
+                description=excerpt(result.get("markdown", "")),
+                website=url,
+                tech_stack=[],
+                competitors=[]
+            )
+            self.logger.start_task(task, f"{tool_name}: reading {url or 'page'}", indent=2)
+            content = self.firecrawl.resolve_content(result, deadline.remaining() if deadline else None)
+            if content:
+                company.content = self.blobs.put(content)
+            return company, content
+        
+        except Exception as e:
+            self.logger.log_error(f"Failed to research {tool_name}", e)
+            return None
+        
+        finally:
+            self.logger.end_task(task)
+    
+    
+    def _fetch_known_tool(self, tool_name: str, deadline: Optional[Deadline] = None) -> Optional[Tuple[CompanyInfo, str]]:
+        """Scrape the official page stored for a known tool, skipping the documentation search"""
+        # Only an exact name or known alias may stand in for the search; a near-miss could be another product
+        entry = self.tool_index.lookup(tool_name) if self.tool_index else None
+        if not entry or not entry.url:
+            return None
+        
+        self.logger.start_task(f"tool:{tool_name}", f"{tool_name}: reading {entry.url}", indent=2)
+        content = self.firecrawl.resolve_content({"url": entry.url}, deadline.remaining() if deadline else None)
+        if not content:
+            # The stored page moved or failed; fall back to searching for it
+            return None
+        self.tool_index.count("search_skipped")
+        company = CompanyInfo(
+            name=tool_name,
+            description=excerpt(content),
+            website=entry.url,
+            tech_stack=[],
+            competitors=[]
+        )
+        company.content = self.blobs.put(content)
+        return company, content
+    
+    
+    @staticmethod
+    def _apply_analysis(company: CompanyInfo, analysis: CompanyAnalysis):
+        company.pricing_model = analysis.pricing_model
+        company.is_open_source = analysis.is_open_source
+        company.tech_stack = analysis.tech_stack
+        company.description = analysis.description
+        company.api_available = analysis.api_available 
+        company.language_support = analysis.language_support
+        company.integration_capabilities = analysis.integration_capabilities
+    
+    
+    def _pack_page(self, content: str) -> str:
+        return self.analysis_packer.pack(content, self.settings.analysis_token_budget)
+    
+    
+    def _company_summary(self, company: CompanyInfo) -> str:
+        budget = self.settings.recommendation_token_budget // 8
+        description = company.description
+        if company.pricing_model is None and company.content:
+            # Unanalyzed companies only carry an excerpt, so summarize from the stored page instead
+            description = self.blobs.get(company.content) or description
+        if estimate_tokens(description) > budget:
+            description = self.analysis_packer.pack(description, budget)
+        return company.model_copy(update={"description": description}).model_dump_json(exclude_none=True, exclude={"content"})
     
     
     def _analyze_step(self, state: ResearchState) -> Dict[str, Any]:
+        deadline = self._deadline().stage("analyze")
         self.logger.start_spinner("Generating personalized recommendations...")
         
+        if deadline.expired():
+            self.logger.stop_spinner("")
+            self.logger.log_warning("No time left for recommendations")
+            return {"analysis": RECOMMENDATIONS_FAILED, "partial": ["analysis"]}
+        
         try:
-            company_data = ", ".join([
-                company.json() for company in state.companies[:4]
-            ])
+            company_data = truncate_to_tokens(
+                ", ".join(self._company_summary(company) for company in state.companies[:4]),
+                self.settings.recommendation_token_budget
+            )
         
             messages = [
                 SystemMessage(content=self.prompts.RECOMMENDATIONS_SYSTEM),
                 HumanMessage(content=self.prompts.recommendations_user(state.query, company_data))
             ]
             
-            response = self.llm.invoke(messages)
-            analysis_content = response.content[:1000]
+            writer = get_stream_writer()
+            chunks = []
+            # Bounds each read of the HTTP stream, so an abandoned stream does not linger
+            timeout = self._request_timeout(deadline)
+            
+            def stream_recommendations():
+                try:
+                    for chunk in self.llm.stream(messages, **timeout):
+                        if deadline.expired():
+                            # Past the deadline the node has moved on; drop the rest of the stream
+                            break
+                        text = chunk.content if isinstance(chunk.content, str) else ""
+                        if not text:
+                            continue
+                        if not chunks:
+                            self.logger.stop_spinner("")
+                            self.logger.stream_text("Developer Recommendations: \n" + "-" * 40 + "\n")
+                        chunks.append(text)
+                        self.logger.stream_text(text)
+                        writer({"event": "token", "text": text})
+                except Exception as e:
+                    if chunks:
+                        # Retrying now would repeat text that has already been shown
+                        raise RuntimeError("Recommendation stream interrupted after partial output") from e
+                    raise
+            
+            try:
+                self._within(deadline, lambda: self.scheduler.call("anthropic", stream_recommendations, deadline=deadline.at))
+            except TimeoutError:
+                # Keep whatever streamed before the deadline
+                pass
+            content = "".join(chunks)
+            analysis_content = content[:1000]
             
             last_period = analysis_content.rfind(".")
             if last_period > 500:
                 analysis_content = analysis_content[:last_period + 1]
                 
+            if deadline.expired():
+                self.logger.stop_spinner("")
+                self.logger.log_warning("Recommendations cut short by the query deadline")
+                return {"analysis": content or RECOMMENDATIONS_FAILED, "partial": ["analysis"]}
             self.logger.stop_spinner("Recommendations generated")
             self.logger.log_step("🕗", "Analysis complete")
-            return {"analysis": response.content}
+            return {"analysis": content}
         
         except Exception as e:
             self.logger.stop_spinner("")
             self.logger.log_error("Failed to generate recommendations", e)
-            return {"analysis": "Unable to generate recommendations in given time"}
+            if deadline.expired():
+                return {"analysis": RECOMMENDATIONS_FAILED, "partial": ["analysis"]}
+            return {"analysis": RECOMMENDATIONS_FAILED}
+    
+    
+    def run(self, query: str, run_id: Optional[str] = None, resume: bool = False, deadline: Optional[float] = None) -> ResearchState:
+        """Research a query; with resume, continue an interrupted or failed run of it from its checkpoints
+
+        deadline is a latency budget in seconds (QUERY_DEADLINE when None, 0 for none). Work still
+        unfinished when a stage's slice of it runs out is dropped or kept as far as it got, and the
+        affected fields are listed in the result's partial.
+        """
+        cached = self._cached_result(query)
+        if cached:
+            return cached
+        
+        graph_input, config = self._start_run(query, run_id, resume)
+        config = self._run_config(config, deadline)
+        try:
+            final_state = ResearchState(**self.workflow.invoke(graph_input, config))
+        finally:
+            self._release_run(config)
+        self._finish_run(query, final_state, config)
+        return final_state
+    
+    
+    async def astream(self, query: str, run_id: Optional[str] = None, resume: bool = False,
+                      deadline: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield progress events as the graph runs, ending with {"event": "result", "state": ...}
+
+        Intermediate events are {"event": "tools", "tools": [...]} when research starts,
+        {"event": "company", "company": CompanyInfo} as each tool finishes research and
+        {"event": "token", "text": str} for every chunk of the recommendation text.
+        Cached answers replay the same events at once.
+        """
+        cached = self._cached_result(query)
+        if cached:
+            yield {"event": "tools", "tools": [company.name for company in cached.companies]}
+            for company in cached.companies:
+                yield {"event": "company", "company": company}
+            if cached.analysis:
+                self.logger.stream_text("Developer Recommendations: \n" + "-" * 40 + "\n" + cached.analysis)
+                yield {"event": "token", "text": cached.analysis}
+            yield {"event": "result", "state": cached}
+            return
+        
+        graph_input, config = self._start_run(query, run_id, resume)
+        config = self._run_config(config, deadline)
+        final_state = {}
+        try:
+            async for mode, chunk in self.workflow.astream(graph_input, config, stream_mode=["custom", "values"]):
+                if mode == "custom":
+                    yield chunk
+                else:
+                    final_state = chunk
+        finally:
+            self._release_run(config)
+        state = ResearchState(**final_state)
+        self._finish_run(query, state, config)
+        yield {"event": "result", "state": state}
+    
+    
+    def _start_run(self, query: str, run_id: Optional[str], resume: bool) -> Tuple[Optional[ResearchState], Optional[Dict[str, Any]]]:
+        """Return the graph input and config; a None input tells LangGraph to continue from the checkpoint"""
+        if not self.checkpointer:
+            return ResearchState(query=query), None
+        
+        run_id = run_id or run_id_for(query)
+        with self._runs_lock:
+            if run_id in self._active_runs:
+                # The same question is already running in this process; don't share its checkpoints
+                run_id, resume = f"{run_id}-{uuid.uuid4().hex[:6]}", False
+            self._active_runs.add(run_id)
+        
+        config = {"configurable": {"thread_id": run_id}}
+        if resume:
+            checkpoint = self._resume_point(config)
+            if checkpoint:
+                self.progress.touch(run_id)
+                return None, checkpoint
+        self.progress.delete(run_id)
+        self.progress.touch(run_id)
+        return ResearchState(query=query), config
+    
+    
+    def _run_config(self, config: Optional[Dict[str, Any]], deadline: Optional[float]) -> Dict[str, Any]:
+        """Add the run key and the absolute deadline to the graph config, where every node can read them"""
+        config = config or {}
+        configurable = config.get("configurable", {})
+        # Checkpointed runs already have a thread ID unique among the runs in flight; others get one of their own
+        configurable = {**configurable, "run_key": configurable.get("thread_id") or uuid.uuid4().hex}
+        seconds = self.settings.query_deadline if deadline is None else deadline
+        if seconds:
+            configurable["deadline_at"] = time.time() + seconds
+        return {**config, "configurable": configurable}
+    
+    
+    def _resume_point(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        run_id = config["configurable"]["thread_id"]
+        snapshot = self.workflow.get_state(config)
+        if not snapshot.values:
+            self.logger.log_substep(f"No checkpoint for run {run_id}, starting fresh")
+            return None
+        
+        if snapshot.next:
+            self.logger.log_step("♻️", f"Resuming run {run_id} at {', '.join(snapshot.next)}")
+            return config
+        
+        if snapshot.values.get("partial"):
+            # The deadline cut the run short; replay from the first step that ran out of time,
+            # where work already saved (finished tools) is reused and the rest is done now
+            past = self._first_cut_step(config)
+            if past:
+                self.logger.log_step("♻️", f"Resuming run {run_id} at {', '.join(past.next)}, which ran out of time")
+                return past.config
+        
+        if snapshot.values.get("analysis") == RECOMMENDATIONS_FAILED:
+            # The run finished with failed recommendations; replay from the checkpoint saved before analyze
+            for past in self.workflow.get_state_history(config):
+                if past.next == ("analyze",):
+                    self.logger.log_step("♻️", f"Resuming run {run_id} at analyze")
+                    return past.config
+        
+        self.logger.log_step("♻️", f"Run {run_id} already finished, returning its result")
+        return config
+    
+    
+    def _first_cut_step(self, config: Dict[str, Any]):
+        """The checkpoint taken before the first step that added to partial"""
+        history = list(self.workflow.get_state_history(config))[::-1]
+        for before, after in zip(history, history[1:]):
+            if len(after.values.get("partial", [])) > len(before.values.get("partial", [])):
+                return before
+        return None
+    
+    
+    def _release_run(self, config: Dict[str, Any]):
+        if self.speculation:
+            # Guesses of a run that failed before research would otherwise keep running
+            self.speculation.discard(self._run_key(config))
+        if self.checkpointer:
+            with self._runs_lock:
+                self._active_runs.discard(config["configurable"]["thread_id"])
+    
+    
+    def _finish_run(self, query: str, state: ResearchState, config: Dict[str, Any]):
+        self._remember_result(query, state)
+        if not self.checkpointer:
+            return
+        run_id = config["configurable"]["thread_id"]
+        if self._is_complete(state):
+            self.progress.delete(run_id)
+        else:
+            self.logger.log_warning(f"Run {run_id} is incomplete; its checkpoints are kept so it can be resumed")
+    
+    
+    def _cached_result(self, query: str) -> Optional[ResearchState]:
+        if not self.query_cache:
+            return None
+        with self.profiler.span("query_cache.get", "cache", cache_hit=False) as span:
+            match = self.query_cache.get(query)
+            span["cache_hit"] = match is not None
+        if not match:
+            return None
+        
+        state, cached_query, similarity = match
+        if similarity < 1.0:
+            self.logger.log_step("⚡", f'Answered from cache (matched "{cached_query}", similarity {similarity:.2f})')
+        else:
+            self.logger.log_step("⚡", "Answered from cache")
+        return state.model_copy(update={"query": query})
+    
+    
+    def _remember_result(self, query: str, state: ResearchState):
+        # Only complete answers are worth replaying to near-duplicate questions
+        if self.query_cache and self._is_complete(state):
+            self.query_cache.put(query, state)
+    
+    
+    @staticmethod
+    def _is_complete(state: ResearchState) -> bool:
+        return bool(state.companies and state.analysis and state.analysis != RECOMMENDATIONS_FAILED and not state.partial)
     
     
-    def run(self, query: str) -> ResearchState:
-        initial_state = ResearchState(query=query)
-        final_state = self.workflow.invoke(initial_state)
-        return ResearchState(**final_state)
\ No newline at end of file
+    async def arun(self, query: str, run_id: Optional[str] = None, resume: bool = False,
+                   deadline: Optional[float] = None) -> ResearchState:
+        async for event in self.astream(query, run_id, resume, deadline):
+            if event["event"] == "result":
+                return event["state"]
\ No newline at end of file
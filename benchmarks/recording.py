@@ -0,0 +1,77 @@
+"""Recorders that capture live Firecrawl and Anthropic responses into benchmark fixtures"""
+from typing import Any, Iterator, List
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from app.cache import normalize_query, normalize_url
+from app.stubs import Fixtures, prompt_key
+
+
+class RecordingFirecrawlApp:
+    """Wraps a live FirecrawlApp and stores every successful response into fixtures"""
+
+    def __init__(self, app, fixtures: Fixtures):
+        self.app = app
+        self.fixtures = fixtures
+
+
+    def search(self, query: str, **kwargs):
+        result = self.app.search(query=query, **kwargs)
+        if result and result.data:
+            with self.fixtures._lock:
+                self.fixtures.search[normalize_query(query)] = result.data
+        return result
+
+
+    def scrape_url(self, url: str, **kwargs):
+        result = self.app.scrape_url(url, **kwargs)
+        if result and result.markdown:
+            with self.fixtures._lock:
+                self.fixtures.scrape[normalize_url(url)] = result.markdown
+        return result
+
+
+class RecordingChatModel(BaseChatModel):
+    """Wraps a live chat model and stores every response into fixtures under its prompt_key"""
+
+    live: Any
+    fixtures: Any
+
+
+    @property
+    def _llm_type(self) -> str:
+        return "recording-chat-model"
+
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = self.live.invoke(messages, stop=stop, **kwargs)
+        self._store(messages, message.content)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs) -> Iterator[ChatGenerationChunk]:
+        pieces = []
+        for chunk in self.live.stream(messages, stop=stop, **kwargs):
+            pieces.append(chunk.content if isinstance(chunk.content, str) else "")
+            generation = ChatGenerationChunk(message=AIMessageChunk(content=chunk.content, usage_metadata=chunk.usage_metadata))
+            if run_manager:
+                run_manager.on_llm_new_token(pieces[-1], chunk=generation)
+            yield generation
+        self._store(messages, "".join(pieces))
+
+
+    def with_structured_output(self, schema, **kwargs):
+        structured = self.live.with_structured_output(schema, **kwargs)
+
+        def record(messages, **kwargs):
+            result = structured.invoke(messages, **kwargs)
+            self._store(messages, result.model_dump_json())
+            return result
+        return RunnableLambda(record)
+
+
+    def _store(self, messages: List[BaseMessage], text: str):
+        if text:
+            with self.fixtures._lock:
+                self.fixtures.responses[prompt_key(messages)] = text
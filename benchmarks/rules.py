@@ -0,0 +1,63 @@
+"""Measure the rule-based analysis fast path against recorded pages
+
+    python -m benchmarks.rules --fixtures benchmarks/fixtures.json --show
+    python -m benchmarks.rules --threshold 0.6
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.extractor import REQUIRED_FIELDS, RuleExtractor
+from app.stubs import TOOL_POOL, Fixtures, _tool_page
+
+
+def load_pages(fixtures: Fixtures) -> List[Tuple[str, str]]:
+    """(tool name, markdown) pairs from recorded scrapes and search hits, or synthetic pages"""
+    pages = []
+    for hits in fixtures.search.values():
+        for hit in hits:
+            title = hit.get("metadata", {}).get("title") or hit.get("url", "")
+            if hit.get("markdown"):
+                pages.append((title.split(" - ")[0].split(" | ")[0].strip(), hit["markdown"]))
+    for url, markdown in fixtures.scrape.items():
+        pages.append((url.split("//", 1)[-1].split("/", 1)[0].split(".")[-2].title(), markdown))
+    return pages or [(name, _tool_page(name)) for name in TOOL_POOL]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hit rate of the rule-based CompanyAnalysis extractor")
+    parser.add_argument("--fixtures", help="Recorded responses (defaults to synthetic pages)")
+    parser.add_argument("--threshold", type=float, default=0.8, help="Minimum confidence for a field to count")
+    parser.add_argument("--show", action="store_true", help="Print the extracted fields for every page")
+    parser.add_argument("--json", action="store_true", help="Print the stats as JSON")
+    args = parser.parse_args(argv)
+
+    extractor = RuleExtractor(args.threshold)
+    missing: Dict[str, int] = dict.fromkeys(REQUIRED_FIELDS, 0)
+    for name, markdown in load_pages(Fixtures.load(args.fixtures)):
+        result = extractor.extract(markdown, name)
+        confident = result.confident()
+        for field in REQUIRED_FIELDS:
+            missing[field] += field not in confident
+        if args.show:
+            print(f"{name}: {'LLM skipped' if result.complete else 'needs LLM'}")
+            for field in REQUIRED_FIELDS:
+                value = result.fields.get(field, "-")
+                print(f"  {field:<26}{result.confidence.get(field, 0.0):>5.2f}  {value}")
+
+    stats = extractor.stats()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+
+    print(f"Pages: {stats['pages']}  LLM calls skipped: {stats['llm_skipped']} ({stats['hit_rate']:.0%})")
+    for field, rate in stats["fields"].items():
+        print(f"  {field:<26}{rate:>7.0%}  missing on {missing[field]} pages")
+
+
+if __name__ == "__main__":
+    main()
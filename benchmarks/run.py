@@ -0,0 +1,244 @@
+"""Offline benchmark: drive Workflow.run over a query corpus against recorded or synthetic backends
+
+    python -m benchmarks.run --corpus queries.jsonl --limit 20 --llm-latency 0.8
+    python -m benchmarks.run --fixtures benchmarks/fixtures.json --json
+    python -m benchmarks.run --record benchmarks/fixtures.json   # live Firecrawl and Anthropic, needs API keys
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+from dataclasses import replace
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.batch import read_queries
+from app.config import Settings
+from app.logger import ProgressLogger
+from app.callbacks import LLMProfilingHandler
+from app.profiling import Profiler
+from app.workflow import Workflow
+from app.stubs import FakeChatModel, FakeFirecrawlApp, Fixtures, Latency
+from benchmarks.recording import RecordingChatModel, RecordingFirecrawlApp
+
+
+DEFAULT_QUERIES = [
+    "React alternatives",
+    "alternatives to React",
+    "databases better than MySQL",
+    "hosting platforms like AWS",
+    "vector databases for AI apps",
+    "free alternatives to Heroku",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def load_corpus(path: str, limit: int) -> List[str]:
+    if not path:
+        queries = list(DEFAULT_QUERIES)
+    else:
+        with open(path, encoding="utf-8") as f:
+            queries = [record["query"] for record in read_queries(f)]
+    return queries[:limit] if limit else queries
+
+
+def build_workflow(args, profiler: Profiler, fixtures: Fixtures, cache_dir: str):
+    settings = replace(
+        Settings.from_env(),
+        cache_enabled=args.cache,
+        cache_dir=cache_dir,
+        research_concurrency=args.research_concurrency or Settings.from_env().research_concurrency,
+        analysis_mode=args.analysis_mode or Settings.from_env().analysis_mode,
+    )
+
+    if args.record:
+        from firecrawl import FirecrawlApp
+        app = RecordingFirecrawlApp(FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY")), fixtures)
+        llm = None
+    else:
+        app = FakeFirecrawlApp(
+            fixtures,
+            search_latency=Latency(args.search_latency, seed=1),
+            scrape_latency=Latency(args.scrape_latency, seed=2),
+            embedded_chars=args.embedded_chars,
+        )
+        llm = FakeChatModel(
+            latency=args.llm_latency,
+            overrides=fixtures.llm,
+            recorded=fixtures.responses,
+            callbacks=[LLMProfilingHandler(profiler)],
+        )
+
+    workflow = Workflow(
+        settings,
+        logger=ProgressLogger(mode="quiet"),
+        profiler=profiler,
+        firecrawl_app=app,
+        llm=llm,
+    )
+    if args.record:
+        # Wrap the workflow's own Anthropic model so recording goes through the same client settings
+        workflow.llm = RecordingChatModel(live=workflow.llm, fixtures=fixtures)
+    return workflow
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    queries = load_corpus(args.corpus, args.limit)
+    fixtures = Fixtures.load(args.fixtures if not args.record else None)
+    profiler = Profiler()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        workflow = build_workflow(args, profiler, fixtures, cache_dir)
+        latencies: List[float] = []
+        node_totals: Dict[str, List[float]] = defaultdict(list)
+        calls: Counter = Counter()
+        cache_hits = 0
+        tokens: Counter = Counter()
+        dedup: Counter = Counter()
+        companies = 0
+        state_bytes: List[int] = []
+
+        for _ in range(args.repeat):
+            for query in queries:
+                first_span = profiler.mark()
+                started = time.perf_counter()
+                with redirect_stdout(io.StringIO()):
+                    state = workflow.run(query)
+                latencies.append(time.perf_counter() - started)
+                companies += len(state.companies)
+                state_bytes.append(len(state.model_dump_json()))
+
+                for row in profiler.summary(since=first_span):
+                    if row["cat"] == "node":
+                        node_totals[row["name"]].append(row["total"])
+                    else:
+                        calls[row["name"]] += row["count"]
+                        cache_hits += row["counters"].get("cache_hit", 0)
+                        if row["cat"] == "dedup":
+                            dedup.update({key: row["counters"].get(key, 0) for key in ("bytes_saved", "tokens_saved")})
+                        if row["cat"] == "llm":
+                            tokens["input"] += row["counters"].get("input_tokens", 0)
+                            tokens["output"] += row["counters"].get("output_tokens", 0)
+
+        cache_stats = workflow.firecrawl.cache.stats() if workflow.firecrawl.cache else None
+        scheduler_metrics = workflow.scheduler.metrics()
+        content_stats = dict(workflow.firecrawl.content_stats)
+        rule_stats = workflow.rule_extractor.stats() if workflow.rule_extractor else None
+        query_stats = workflow.query_cache.stats() if workflow.query_cache else None
+        blob_stats = workflow.blobs.stats()
+        speculation_stats = workflow.speculation.stats() if workflow.speculation else None
+        backend_calls = Counter()
+        if isinstance(workflow.firecrawl.app, FakeFirecrawlApp):
+            backend_calls.update({f"firecrawl.{kind}": n for kind, n in workflow.firecrawl.app.calls.items()})
+        if isinstance(workflow.llm, FakeChatModel):
+            backend_calls.update({f"llm.{kind}": n for kind, n in workflow.llm.calls.items()})
+
+    if args.record:
+        fixtures.save(args.record)
+
+    runs = len(latencies)
+    return {
+        "runs": runs,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "mean": sum(latencies) / runs if runs else 0.0,
+        "nodes": {name: sum(values) / len(values) for name, values in node_totals.items()},
+        "calls_per_query": {name: count / runs for name, count in sorted(calls.items())} if runs else {},
+        "backend_calls_per_query": {name: count / runs for name, count in sorted(backend_calls.items())} if runs else {},
+        "llm_tokens_per_query": {kind: count / runs for kind, count in tokens.items()} if runs else {},
+        "dedup_saved_per_query": {kind: count / runs for kind, count in dedup.items()} if runs else {},
+        "cache_hits": cache_hits,
+        "firecrawl_cache": cache_stats,
+        "scheduler": scheduler_metrics,
+        "rule_extraction": rule_stats,
+        "query_cache": query_stats,
+        "speculation": speculation_stats,
+        "scrapes_avoided": content_stats["embedded"],
+        "scrapes_needed": content_stats["scraped"],
+        "companies_per_query": companies / runs if runs else 0.0,
+        "state_bytes": {"mean": sum(state_bytes) / runs, "max": max(state_bytes)} if runs else {},
+        "blob_store": blob_stats,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"Runs: {report['runs']}")
+    print(f"End-to-end  p50 {report['p50']:.3f}s  p95 {report['p95']:.3f}s  mean {report['mean']:.3f}s")
+    print("\nMean time per node")
+    for name, seconds in report["nodes"].items():
+        print(f"  {name:<20}{seconds:>8.3f}s")
+    print("\nCalls per query")
+    for name, count in report["calls_per_query"].items():
+        print(f"  {name:<20}{count:>8.2f}")
+    if report["backend_calls_per_query"]:
+        print("\nBackend calls per query (after caching)")
+        for name, count in report["backend_calls_per_query"].items():
+            print(f"  {name:<28}{count:>8.2f}")
+    if report["llm_tokens_per_query"]:
+        tokens = report["llm_tokens_per_query"]
+        print(f"\nLLM tokens per query: {tokens.get('input', 0):.0f} in / {tokens.get('output', 0):.0f} out")
+    if report["dedup_saved_per_query"]:
+        saved = report["dedup_saved_per_query"]
+        print(f"Duplicate article text removed per query: {saved.get('bytes_saved', 0):.0f} bytes / ~{saved.get('tokens_saved', 0):.0f} tokens")
+    print(f"\nCache hits: {report['cache_hits']}")
+    print(f"Scrapes avoided (search markdown reused): {report['scrapes_avoided']} of "
+          f"{report['scrapes_avoided'] + report['scrapes_needed']}")
+    if report["query_cache"]:
+        queries = report["query_cache"]
+        print(f"Query cache: {queries['exact_hits']} exact + {queries['fuzzy_hits']} near-duplicate hits, "
+              f"{queries['misses']} misses")
+    if report["rule_extraction"]:
+        rules = report["rule_extraction"]
+        print(f"Rule fast path: {rules['llm_skipped']} of {rules['pages']} analyses skipped the LLM ({rules['hit_rate']:.0%})")
+    if report["speculation"]:
+        guesses = report["speculation"]
+        print(f"Speculative research: {guesses['reused']} of {guesses['started']} guesses reused ({guesses['hit_rate']:.0%})")
+    print(f"Companies per query: {report['companies_per_query']:.2f}")
+    if report["state_bytes"]:
+        blobs = report["blob_store"]
+        print(f"ResearchState size: mean {report['state_bytes']['mean'] / 1024:.1f} KB, max {report['state_bytes']['max'] / 1024:.1f} KB"
+              f" ({blobs['writes']} blobs, {blobs['bytes_in'] / 1024:.0f} KB stored as {blobs['bytes_stored'] / 1024:.0f} KB)")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline latency benchmark for the research workflow")
+    parser.add_argument("--corpus", help="JSONL query file (defaults to a built-in query list)")
+    parser.add_argument("--limit", type=int, default=0, help="Only run the first N queries")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the corpus this many times")
+    parser.add_argument("--fixtures", help="Recorded responses to replay")
+    parser.add_argument("--record", metavar="FILE", help="Call live Firecrawl and Anthropic and save their responses as fixtures for replay")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Injected seconds per search call")
+    parser.add_argument("--scrape-latency", type=float, default=0.0, help="Injected seconds per scrape call")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Injected seconds per LLM call")
+    parser.add_argument("--embedded-chars", type=int, help="Truncate synthetic search-hit markdown to N characters")
+    parser.add_argument("--research-concurrency", type=int, help="Override RESEARCH_CONCURRENCY")
+    parser.add_argument("--analysis-mode", choices=["per_tool", "batch"], help="Override ANALYSIS_MODE")
+    parser.add_argument("--cache", action="store_true", help="Enable the Firecrawl/analysis caches (fresh temp dir)")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_benchmark(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Startup benchmark: time from launching main.py to the first prompt, plus an -X importtime breakdown
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --budget 0.5 --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from statistics import median
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROMPT = "Developer Tools Question".encode("utf-8")
+
+
+def time_to_prompt() -> float:
+    """Seconds until main.py prints its input prompt; the process is told to exit right after"""
+    env = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-u", "main.py"],
+        cwd=ROOT, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    seen = b""
+    try:
+        while PROMPT not in seen:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("main.py exited before showing the prompt")
+            seen += chunk
+        elapsed = time.perf_counter() - started
+        process.communicate(b"exit\n", timeout=30)
+    finally:
+        if process.poll() is None:
+            process.kill()
+    return elapsed
+
+
+def import_breakdown(module: str = "main") -> Dict[str, Any]:
+    """Cumulative import time of a module and of each top-level package it pulls in"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    packages: Dict[str, int] = defaultdict(int)
+    children: List[tuple] = []
+    total = 0
+    # Children are listed before their parent, so collect direct imports until the module's own line
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        if depth == 1:
+            children.append((name, int(cumulative)))
+        elif depth == 0:
+            if name == module:
+                total = int(cumulative)
+                for child, us in children:
+                    packages[child.split(".")[0]] += us
+            children = []
+    return {
+        "module": module,
+        "total": total / 1e6,
+        "packages": {name: us / 1e6 for name, us in sorted(packages.items(), key=lambda item: -item[1])},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure CLI cold start and import cost")
+    parser.add_argument("--runs", type=int, default=5, help="Number of launches to time")
+    parser.add_argument("--budget", type=float, default=0.5, help="Fail when median time to prompt exceeds this (seconds)")
+    parser.add_argument("--top", type=int, default=10, help="Packages to list in the import breakdown")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    samples: List[float] = [time_to_prompt() for _ in range(args.runs)]
+    imports = import_breakdown()
+    report = {
+        "time_to_prompt": {"median": median(samples), "min": min(samples), "max": max(samples), "runs": len(samples)},
+        "budget": args.budget,
+        "within_budget": median(samples) <= args.budget,
+        "imports": {**imports, "packages": dict(list(imports["packages"].items())[:args.top])},
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        prompt = report["time_to_prompt"]
+        status = "OK" if report["within_budget"] else "OVER BUDGET"
+        print(f"Time to prompt: median {prompt['median']:.3f}s  min {prompt['min']:.3f}s  max {prompt['max']:.3f}s"
+              f"  (budget {args.budget:.2f}s, {status})")
+        print(f"\nimport main: {imports['total']:.3f}s cumulative")
+        for name, seconds in report["imports"]["packages"].items():
+            print(f"  {name:<28}{seconds:>8.3f}s")
+    sys.exit(0 if report["within_budget"] else 1)
+
+
+if __name__ == "__main__":
+    main()
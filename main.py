@@ -1,8 +1,14 @@
 import os
-import time
+import sys
+import argparse
 from dotenv import load_dotenv
-from app.workflow import Workflow
+from app.config import Settings
+from app.logger import ProgressLogger
+from app.profiling import Profiler
+from app.warmup import Warmup
 
+# LangGraph, LangChain and Firecrawl take over a second to import, so modes import
+# app.workflow (and asyncio) only when they need it and the prompt appears right away
 load_dotenv()
 
 
@@ -50,13 +56,208 @@ def show_help():
     print(help_text)
     
 
+def print_company(i, company):
+    print(f"\n{i}. 🏢 {company.name}")
+    print(f"   🌐 Website: {company.website}")
+    print(f"   💰 Pricing: {company.pricing_model}")
+    print(f"   📖 Open Source: {company.is_open_source}")
+
+    if company.tech_stack:
+        print(f"   🛠️  Tech Stack: {', '.join(company.tech_stack[:5])}")
+
+    if company.language_support:
+        print(
+            f"   💻 Language Support: {', '.join(company.language_support[:5])}"
+        )
+
+    if company.api_available is not None:
+        api_status = (
+            "✅ Available" if company.api_available else "❌ Not Available"
+        )
+        print(f"   🔌 API: {api_status}")
+
+    if company.integration_capabilities:
+        print(
+            f"   🔗 Integrations: {', '.join(company.integration_capabilities[:4])}"
+        )
+
+    if company.description and company.description != "Analysis failed":
+        print(f"   📝 Description: {company.description}")
+
+    print()
+
+
+def print_results_header(query):
+    print(f"\n📊 Results for: {query}")
+    print("=" * 60)
+
+
+async def render_query(workflow, query, resume=False, deadline=None):
+    shown = 0
+    streamed = []
+    state = None
+
+    async for event in workflow.astream(query, resume=resume, deadline=deadline):
+        if event["event"] == "company":
+            with workflow.logger.paused():
+                if shown == 0:
+                    print_results_header(query)
+                shown += 1
+                print_company(shown, event["company"])
+        elif event["event"] == "token":
+            streamed.append(event["text"])
+        elif event["event"] == "result":
+            state = event["state"]
+
+    with workflow.logger.paused():
+        if shown == 0:
+            print_results_header(query)
+            print("\nNo tools found.")
+        # Tokens only reach the screen in interactive mode, and a failed or fallen-back stream
+        # leaves a final analysis that differs from what was shown
+        shown_text = "".join(streamed) if workflow.logger.animate else ""
+        if state and state.analysis and state.analysis != shown_text:
+            print("\nDeveloper Recommendations: ")
+            print("-" * 40)
+            print(state.analysis)
+        if state and state.partial:
+            print(f"\n⏱️  Deadline reached; partial results for: {', '.join(state.partial)}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Coding Research AI Agent")
+    parser.add_argument("--batch", metavar="FILE", help="Run queries from a JSONL file ('-' for stdin) instead of the prompt")
+    parser.add_argument("--output", metavar="FILE", help="Write batch results as JSONL to this file (default: stdout)")
+    parser.add_argument("--concurrency", type=int, help="Number of batch queries researched at once")
+    parser.add_argument("--serve", action="store_true", help="Run the JSON research API instead of the prompt")
+    parser.add_argument("--host", help="Address for --serve (default: SERVER_HOST or 127.0.0.1)")
+    parser.add_argument("--port", type=int, help="Port for --serve (default: SERVER_PORT or 8080)")
+    parser.add_argument("--deadline", type=float, metavar="SECONDS",
+                        help="Latency budget per query; slow stages return partial results (default: QUERY_DEADLINE)")
+    parser.add_argument("--resume", action="store_true", help="Continue interrupted or failed runs of the same queries from their checkpoints (prompt and --batch)")
+    parser.add_argument("--stub", action="store_true", help="Use offline fake Firecrawl/LLM backends (no API keys needed)")
+    parser.add_argument("--log", choices=["interactive", "plain", "quiet", "json"],
+                        help="Progress output (default: spinners on a terminal, plain lines for --batch/--serve)")
+    parser.add_argument("--profile", action="store_true", help="Print a per-stage timing summary after each query")
+    parser.add_argument("--trace", metavar="FILE", help="Export timing spans (.jsonl, otherwise Chrome trace JSON)")
+    return parser.parse_args()
+
+
+def build_profiler(args):
+    return Profiler(enabled=bool(args.profile or args.trace))
+
+
+def format_scheduler_metrics(workflow):
+    lines = []
+    for provider, metrics in workflow.scheduler.metrics().items():
+        counters = ", ".join(f"{key}={value}" for key, value in metrics.items())
+        lines.append(f"{provider:<22}{counters}")
+    pool = workflow.http.metrics()["firecrawl"]
+    if pool["requests"]:
+        lines.append(f"{'http.firecrawl':<22}requests={pool['requests']}, connections={pool['connections']}, "
+                     f"reuse_rate={pool['reuse_rate']}, idle={pool['idle']}, in_use={pool['in_use']}")
+    if workflow.rule_extractor:
+        rules = workflow.rule_extractor.stats()
+        lines.append(f"{'rules':<22}pages={rules['pages']}, llm_skipped={rules['llm_skipped']}, hit_rate={rules['hit_rate']}")
+    if workflow.tool_index:
+        tools = workflow.tool_index.stats()
+        lines.append(f"{'tool_index':<22}tools={tools['tools']}, hits={tools['hits']}, merged={tools['merged']}, "
+                     f"search_skipped={tools['search_skipped']}")
+    if workflow.speculation:
+        guesses = workflow.speculation.stats()
+        lines.append(f"{'speculation':<22}started={guesses['started']}, reused={guesses['reused']}, "
+                     f"cancelled={guesses['cancelled']}, hit_rate={guesses['hit_rate']}")
+    return "\n".join(lines)
+
+
+def build_workflow(args, profiler, logger=None, settings=None):
+    from dataclasses import replace
+    from app.workflow import Workflow
+    settings = settings or Settings.from_env()
+    if args.serve or not args.resume:
+        # Checkpoints only pay off when a run can be resumed, and server runs never are; skip the per-step writes otherwise
+        settings = replace(settings, checkpoint_enabled=False)
+    firecrawl_app, llm = build_backends(args)
+    return Workflow(settings, logger=logger, profiler=profiler, firecrawl_app=firecrawl_app, llm=llm)
+
+
+def build_backends(args):
+    if not args.stub:
+        return None, None
+    from app.stubs import FakeChatModel, FakeFirecrawlApp, Latency
+    return FakeFirecrawlApp(search_latency=Latency(0.3), scrape_latency=Latency(0.5)), FakeChatModel(latency=0.5)
+
+
+def run_server_mode(args):
+    import asyncio
+    from app.server import ResearchServer
+
+    settings = Settings.from_env()
+    profiler = build_profiler(args)
+    workflow = build_workflow(args, profiler, ProgressLogger(mode=args.log or "plain"), settings)
+    server = ResearchServer(
+        workflow,
+        workers=settings.server_workers,
+        queue_size=settings.server_queue_size,
+        request_timeout=settings.server_request_timeout
+    )
+
+    host = args.host or settings.server_host
+    port = args.port or settings.server_port
+    print(f"🚀 Research API listening on http://{host}:{port} (POST /research, GET /health, GET /metrics)")
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        if args.trace:
+            profiler.export(args.trace)
+    return 0
+
+
+def run_batch_mode(args):
+    from app.batch import read_queries, run_batch
+
+    settings = Settings.from_env()
+    profiler = build_profiler(args)
+    workflow = build_workflow(args, profiler, ProgressLogger(mode=args.log or "plain"), settings)
+    concurrency = args.concurrency or settings.batch_concurrency
+
+    source = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        failures = run_batch(workflow, read_queries(source), output, concurrency, resume=args.resume, deadline=args.deadline)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    if args.profile:
+        print(profiler.format_summary(), file=sys.stderr)
+        print(format_scheduler_metrics(workflow), file=sys.stderr)
+    if args.trace:
+        profiler.export(args.trace)
+    return 1 if failures else 0
+
+
 def main():
+    args = parse_args()
+    if args.batch:
+        sys.exit(run_batch_mode(args))
+    if args.serve:
+        sys.exit(run_server_mode(args))
+
     print_intro()
-    workflow = Workflow()
+    profiler = build_profiler(args)
+    # Build the workflow while the user reads the banner and types the first question
+    warmup = Warmup(lambda: build_workflow(args, profiler, ProgressLogger(mode=args.log)))
 
     while True:
         query = input("\n❔ Developer Tools Question: ").strip()
         if query.lower() in {"quit", "exit"}:
+            if args.trace:
+                profiler.export(args.trace)
             print("\n👋 Thanks for using Coding Research AI Agent!")
             break
         elif query.lower() == "help":
@@ -67,44 +268,24 @@ def main():
             print_intro()
             continue
         elif query:
-            result = workflow.run(query)
-            print(f"\n📊 Results for: {query}")
-            print("=" * 60)
-
-            for i, company in enumerate(result.companies, 1):
-                print(f"\n{i}. 🏢 {company.name}")
-                print(f"   🌐 Website: {company.website}")
-                print(f"   💰 Pricing: {company.pricing_model}")
-                print(f"   📖 Open Source: {company.is_open_source}")
-
-                if company.tech_stack:
-                    print(f"   🛠️  Tech Stack: {', '.join(company.tech_stack[:5])}")
-
-                if company.language_support:
-                    print(
-                        f"   💻 Language Support: {', '.join(company.language_support[:5])}"
-                    )
-
-                if company.api_available is not None:
-                    api_status = (
-                        "✅ Available" if company.api_available else "❌ Not Available"
-                    )
-                    print(f"   🔌 API: {api_status}")
-
-                if company.integration_capabilities:
-                    print(
-                        f"   🔗 Integrations: {', '.join(company.integration_capabilities[:4])}"
-                    )
-
-                if company.description and company.description != "Analysis failed":
-                    print(f"   📝 Description: {company.description}")
-
-                print()
-
-            if result.analysis:
-                print("Developer Recommendations: ")
-                print("-" * 40)
-                print(result.analysis)
+            import asyncio
+            if not warmup.ready:
+                print("⏳ Loading research tools...")
+            workflow = warmup.get()
+            first_span = profiler.mark()
+            try:
+                asyncio.run(render_query(workflow, query, resume=args.resume, deadline=args.deadline))
+            except KeyboardInterrupt:
+                if args.resume:
+                    # Checkpoints survive the interrupt, so asking again picks up where the run stopped
+                    print("\n⏸️  Research interrupted; ask the same question again to resume it")
+                else:
+                    print("\n⏸️  Research interrupted")
+                continue
+            if args.profile:
+                print("\n⏱️  Stage timings")
+                print(profiler.format_summary(since=first_span))
+                print(format_scheduler_metrics(workflow))
 
 
 if __name__ == "__main__":
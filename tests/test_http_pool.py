@@ -0,0 +1,83 @@
+import json
+import threading
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from firecrawl import firecrawl as sdk
+from app.config import Settings
+from app.http_pool import HttpPool
+from app.workflow import Workflow
+
+
+class FirecrawlHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if payload.get("query") == "overloaded":
+            status, body = 503, {"error": "busy", "details": "try later"}
+        elif self.path == "/v1/search":
+            status, body = 200, {"success": True, "data": [{"url": "https://example.com", "markdown": payload["query"]}]}
+        else:
+            status, body = 200, {"success": True, "data": {"markdown": f"# {payload['url']}"}}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def firecrawl_server(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FirecrawlHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("FIRECRAWL_API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    yield
+    server.shutdown()
+
+
+@pytest.fixture
+def workflows(firecrawl_server, monkeypatch, tmp_path):
+    monkeypatch.setattr(HttpPool, "_shared", None)
+    settings = replace(Settings.from_env(), cache_dir=str(tmp_path), cache_enabled=False, http_warmup=False)
+    pair = Workflow(settings), Workflow(settings)
+    yield pair
+    pair[0].http.close()
+
+
+def test_workflows_share_one_firecrawl_connection(workflows):
+    first, second = workflows
+
+    assert first.http is second.http
+    assert first.firecrawl.app.session is second.firecrawl.app.session
+    assert first.firecrawl.app.search("react alternatives", limit=1).data[0]["markdown"] == "react alternatives"
+    assert second.firecrawl.app.scrape_url("https://example.com", formats=["markdown"]).markdown == "# https://example.com"
+
+    pool = first.http.metrics()["firecrawl"]
+    assert pool["requests"] == 2
+    assert pool["connections"] == 1
+
+
+def test_sdk_error_handling_runs_over_the_pooled_session(workflows):
+    first, _ = workflows
+
+    with pytest.raises(requests.HTTPError) as error:
+        first.firecrawl.app.search("overloaded", limit=1, timeout=2000)
+    assert error.value.response.status_code == 503
+    assert "Status code 503" in str(error.value)
+    assert first.http.metrics()["firecrawl"]["requests"] == 1
+    # The SDK module is untouched; only the pooled app's methods see the Session
+    assert sdk.requests is requests
+
+
+def test_workflows_share_the_anthropic_http_client(workflows):
+    first, second = workflows
+    # langchain-anthropic caches its httpx client per base URL and timeout
+    assert first.llm._client._client is second.llm._client._client
@@ -0,0 +1,31 @@
+import pytest
+from app.cache import ContentCache
+from app.models import ResearchState
+from app.query_cache import QueryCache, canonical_query
+
+
+@pytest.fixture
+def queries(tmp_path):
+    return QueryCache(ContentCache(str(tmp_path / "queries.db"), ttl=3600, max_bytes=1 << 20), threshold=0.85)
+
+
+def remember(queries: QueryCache, query: str):
+    queries.put(query, ResearchState(query=query, analysis=f"answer for {query}"))
+
+
+def test_canonical_query_keeps_term_order():
+    assert canonical_query("Migrate MySQL to Postgres") == "migrate mysql postgre"
+    assert canonical_query("migrate Postgres to MySQL") == "migrate postgre mysql"
+
+
+def test_swapped_tools_are_a_different_question(queries):
+    remember(queries, "migrate MySQL to Postgres")
+    assert queries.get("migrate Postgres to MySQL") is None
+    assert queries.get("Migrate mysql to postgres")[0].analysis == "answer for migrate MySQL to Postgres"
+
+
+@pytest.mark.parametrize("asked", ["alternatives to React", "React alternatives", "best React alternative"])
+def test_rephrasings_still_match(queries, asked):
+    remember(queries, "React alternatives")
+    match = queries.get(asked)
+    assert match and match[1] == "React alternatives"
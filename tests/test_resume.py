@@ -0,0 +1,60 @@
+import time
+from dataclasses import replace
+from typing import List
+import pytest
+from app.config import Settings
+from app.logger import ProgressLogger
+from app.stubs import FakeChatModel, FakeFirecrawlApp, classify_prompt
+from app.workflow import Workflow
+
+
+QUERY = "react alternatives"
+STALLED = ["Weaviate", "Qdrant"]
+
+
+class StallingChatModel(FakeChatModel):
+    """Fake model whose analysis of the named tools outlasts any short deadline"""
+
+    stall: List[str] = []
+
+    def _respond(self, messages):
+        if classify_prompt(messages) == "analysis" and any(name in messages[-1].content for name in self.stall):
+            time.sleep(2)
+        return super()._respond(messages)
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    return replace(
+        Settings.from_env(), cache_dir=str(tmp_path), cache_enabled=False, http_warmup=False, checkpoint_enabled=True,
+        query_cache_ttl=0, tool_index_enabled=False, rule_extraction=False, analysis_mode="per_tool", research_concurrency=4
+    )
+
+
+def workflow(settings, stall=()) -> Workflow:
+    return Workflow(settings, logger=ProgressLogger(mode="quiet"), firecrawl_app=FakeFirecrawlApp(),
+                    llm=StallingChatModel(stall=list(stall)))
+
+
+def test_resume_finishes_tools_cut_short_by_the_deadline(settings):
+    first = workflow(settings, STALLED).run(QUERY, deadline=1.0)
+    assert first.partial == ["companies"]
+    unanalyzed = [company.name for company in first.companies if company.pricing_model is None]
+    assert sorted(unanalyzed) == sorted(STALLED)
+
+    resumed = workflow(settings)
+    # A deadline-cut run keeps its checkpoints and the tools that did finish
+    [(run_id, _)] = resumed.progress.runs()
+    assert {key.split(":", 1)[1] for key in resumed.progress.load(run_id)} == {
+        company.name for company in first.companies if company.pricing_model
+    }
+
+    result = resumed.run(QUERY, resume=True, deadline=0)
+    assert result.partial == []
+    assert [company.name for company in result.companies] == [company.name for company in first.companies]
+    assert all(company.pricing_model for company in result.companies)
+    # Only the tools cut short were analyzed again
+    assert resumed.llm.calls["analysis"] == len(STALLED)
+    assert resumed.progress.runs() == []
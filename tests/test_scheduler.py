@@ -0,0 +1,54 @@
+import pytest
+import requests
+from app.scheduler import CircuitOpenError, ProviderPolicy, Scheduler, classify_error
+
+
+def refused() -> requests.ConnectionError:
+    """A real ConnectionError, whose message carries port=443 but no status"""
+    try:
+        requests.get("https://127.0.0.1:443/v1/search", timeout=2)
+    except requests.ConnectionError as e:
+        return e
+    pytest.skip("something is listening on 127.0.0.1:443")
+
+
+def scheduler(**policy) -> Scheduler:
+    return Scheduler({"firecrawl": ProviderPolicy(rate=1000, burst=1000, base_delay=0, max_delay=0, **policy)})
+
+
+def test_connection_errors_are_transient():
+    error = refused()
+    assert "port=443" in str(error)
+    assert classify_error(error) == (True, False, None)
+    assert classify_error(requests.ReadTimeout("HTTPSConnectionPool(host='api.firecrawl.dev', port=443): Read timed out.")) == (True, False, None)
+
+
+@pytest.mark.parametrize("message, retryable", [
+    ("Unexpected error during search: Status code 503. busy - none", True),
+    ("Failed to parse Firecrawl error response as JSON. Status code: 502", True),
+    ("Unexpected error during search: Status code 404. missing - none", False),
+    ("Payment Required: Failed to search. 402 credits left on port 443", False),
+])
+def test_status_is_only_read_when_anchored(message, retryable):
+    assert classify_error(Exception(message))[0] is retryable
+
+
+def test_connection_errors_are_retried_and_open_the_breaker():
+    error = refused()
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise error
+
+    tasks = scheduler(max_retries=2, failure_threshold=3)
+    with pytest.raises(requests.ConnectionError):
+        tasks.call("firecrawl", fail)
+    assert len(calls) == 3
+
+    metrics = tasks.metrics()["firecrawl"]
+    assert metrics["retries"] == 2 and metrics["failures"] == 1
+    assert metrics["circuit"] == "open"
+    with pytest.raises(CircuitOpenError):
+        tasks.call("firecrawl", fail)
+    assert len(calls) == 3
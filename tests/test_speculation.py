@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import pytest
+from app.config import Settings
+from app.deadline import Deadline
+from app.logger import ProgressLogger
+from app.speculation import Speculation
+from app.stubs import FakeChatModel, FakeFirecrawlApp, Latency
+from app.workflow import Workflow
+
+
+QUERY = "react alternatives"
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    monkeypatch.setenv("FIRECRAWL_API_KEY", "test")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test")
+    return replace(
+        Settings.from_env(), cache_dir=str(tmp_path), cache_enabled=False, http_warmup=False, checkpoint_enabled=False,
+        query_cache_ttl=0, tool_index_enabled=False, speculative_research=True
+    )
+
+
+def test_guesses_get_the_run_deadline():
+    seen = {}
+
+    def research(name, cancelled, deadline=None):
+        seen[name] = deadline
+
+    speculation = Speculation(research)
+    deadline = Deadline.after(5)
+    speculation.start("run", ["Supabase", "Neon"], deadline)
+    for future in speculation.claim("run", ["Supabase", "Neon"]).values():
+        future.result()
+    speculation.shutdown()
+    assert seen == {"Supabase": deadline, "Neon": deadline}
+
+
+def workflow(settings, latency: float = 0.0) -> Workflow:
+    return Workflow(settings, logger=ProgressLogger(mode="quiet"), llm=FakeChatModel(latency=latency, jitter=0),
+                    firecrawl_app=FakeFirecrawlApp(search_latency=Latency(latency, 0), scrape_latency=Latency(latency, 0)))
+
+
+def test_a_guess_past_the_deadline_spends_nothing(settings):
+    runner = workflow(settings)
+    assert runner._research_tool("Supabase", threading.Event(), deadline=Deadline(time.time() - 1)) is None
+    assert sum(runner.firecrawl.app.calls.values()) == 0
+    assert sum(runner.llm.calls.values()) == 0
+
+
+def test_identical_queries_in_flight_keep_their_own_guesses(settings):
+    solo = workflow(settings, 0.05)
+    solo.run(QUERY)
+    reused = solo.speculation.stats()["reused"]
+    assert reused > 0
+
+    runner = workflow(settings, 0.05)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(lambda _: runner.run(QUERY), range(2)))
+    assert all(company.pricing_model for result in results for company in result.companies)
+    # Neither run discarded or claimed the other's guesses
+    stats = runner.speculation.stats()
+    assert stats["reused"] == 2 * reused
+    assert stats["started"] == stats["reused"] + stats["cancelled"]
@@ -0,0 +1,73 @@
+import pytest
+from app.cache import ContentCache
+from app.tool_index import ToolIndex
+
+
+NEAR_MISSES = [
+    ("PostgREST", "PostgreSQL"),
+    ("PostgREST", "Postgres"),
+    ("Google Cloud Run", "Google Cloud"),
+    ("Google Cloud SQL", "Google Cloud"),
+    ("Visual Studio", "Visual Studio Code"),
+    ("AngularJS", "Angular"),
+    ("GitLab CI", "GitLab"),
+    ("Amazon DynamoDB Local", "Amazon DynamoDB"),
+    ("MSSQL", "MySQL"),
+]
+
+
+@pytest.fixture
+def index():
+    tools = ToolIndex()
+    for name in ("Angular", "GitLab", "MySQL"):
+        tools.record(name, f"https://{name.lower()}.example.com")
+    return tools
+
+
+@pytest.mark.parametrize("name, known", NEAR_MISSES)
+def test_near_misses_do_not_resolve_to_the_known_tool(index, name, known):
+    entry = index.resolve(name)
+    assert entry is None or entry.name != known
+
+
+@pytest.mark.parametrize("name, known", NEAR_MISSES)
+def test_near_misses_stay_separate_in_canonicalize(index, name, known):
+    result = index.canonicalize([known, name])
+    assert len(result) == 2 and result[1] == name
+
+
+@pytest.mark.parametrize("name, known", NEAR_MISSES)
+def test_recording_a_near_miss_keeps_the_known_url(index, name, known):
+    index.record(known, "https://known.example.com")
+    index.record(name, "https://other.example.com")
+
+    assert index.lookup(known).url == "https://known.example.com"
+    assert index.lookup(name).url == "https://other.example.com"
+    assert name not in index.lookup(known).aliases
+
+
+def test_aliases_and_spelling_variants_resolve(index):
+    assert index.canonicalize(["Postgres", "PostgreSQL", "Postgres (Neon)", "VS Code", "Next.js", "NextJS"]) == [
+        "PostgreSQL", "Visual Studio Code", "Next.js"
+    ]
+
+
+def test_single_typo_resolves_but_does_not_skip_search(index):
+    index.record("Kubernetes", "https://kubernetes.io")
+
+    assert index.resolve("Kubernates").name == "Kubernetes"
+    assert index.lookup("Kubernates") is None
+
+
+def test_exact_match_distance_zero_disables_fuzzy_matching():
+    tools = ToolIndex(max_distance=0)
+    assert tools.resolve("Kubernates") is None
+    assert tools.resolve("k8s").name == "Kubernetes"
+
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = ContentCache(str(tmp_path / "tools.db"), ttl=3600, max_bytes=1 << 20)
+    ToolIndex(cache).record("Supabase", "https://supabase.com/pricing", "databases")
+
+    entry = ToolIndex(cache).lookup("supabase")
+    assert (entry.url, entry.domain, entry.category) == ("https://supabase.com/pricing", "supabase.com", "databases")